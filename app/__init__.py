@@ -8,15 +8,12 @@ from logging.handlers import RotatingFileHandler
 
 load_dotenv()
 
-env = os.getenv("FLASK_ENV", "production")
-if env == "production":
-    import eventlet
-
-    eventlet.monkey_patch()
-
 from flask import Flask, render_template  # noqa: E402
+from app.config import get_config  # noqa: E402
 from app.error_handlers import register_error_handlers  # noqa: E402
-from app.extensions import api, cors, db, jwt, migrate, socketio  # noqa: E402
+from app.utils.json_provider import ORJSONProvider  # noqa: E402
+from app.utils.openapi import cached_spec_view  # noqa: E402
+from app.extensions import cache, db, jwt  # noqa: E402
 
 print("Loaded env source:", os.getenv("SOURCE"))
 
@@ -34,21 +31,25 @@ def create_app() -> Flask:
         static_folder=static_folder,
         static_url_path="/assets",
     )
+    app.json = ORJSONProvider(app)
 
     config_name = os.getenv("FLASK_ENV", "production").lower()
-    if config_name == "development":
-        app.config.from_object("app.config.DevelopmentConfig")
-    elif config_name == "testing":
-        app.config.from_object("app.config.TestingConfig")
-    else:
-        app.config.from_object("app.config.ProductionConfig")
+    app.config.from_object(get_config(config_name))
+
+    # Web-only extensions are created on first import (see app.extensions)
+    from app.extensions import api, cors, migrate, socketio
+    from app.orders.services import OrderEventDispatcher
+    from app.websocket.emitter import OrderStatusEmitter
 
     # Initialize extensions
     db.init_app(app)
     jwt.init_app(app)
     socketio.init_app(app, message_queue=app.config["SOCKETIO_MESSAGE_QUEUE"])
     migrate.init_app(app, db)
+    cache.init_app(app)
     cors.init_app(app)
+    OrderEventDispatcher(app)
+    OrderStatusEmitter(app)
     api.init_app(app)
     api.spec.components.security_scheme(
         "BearerAuth",
@@ -60,20 +61,31 @@ def create_app() -> Flask:
 
     # Set up logging
     configure_logging(app)
+    configure_pool_logging(app)
 
     # Import models to register with SQLAlchemy metadata
     from app import models  # noqa: F401, E402
     from app.auth.routes import auth_blp
     from app.books.routes import books_blp
     from app.orders.routes import cart_blp
-    from app.health.routes import health_bp
+    from app.health.routes import health_check
     from app.orders.routes import orders_blp
 
-    # Register health check blueprint
-    app.register_blueprint(health_bp, url_prefix="/api/health")
+    # Register the health check directly on the app's URL map; it is
+    # probed constantly and needs no blueprint hooks
+    app.add_url_rule(
+        "/api/health",
+        endpoint="health_check",
+        view_func=health_check,
+        methods=["GET"],
+        strict_slashes=False,
+    )
 
-    # Register the API spec route
-    app.add_url_rule("/api/spec", endpoint="spec", view_func=api.spec.to_dict)
+    # Serve the OpenAPI spec (here and at flask-smorest's openapi.json)
+    # from a body serialized once on first request
+    spec_view = cached_spec_view(api)
+    app.add_url_rule("/api/spec", endpoint="spec", view_func=spec_view)
+    app.view_functions["api-docs.openapi_json"] = spec_view
 
     # Register API blueprints
     api.register_blueprint(auth_blp)
@@ -95,12 +107,28 @@ def create_app() -> Flask:
     return app
 
 
+def configure_pool_logging(app):
+    """Log the connection pool's usage whenever it opens a connection."""
+    from sqlalchemy import event
+
+    with app.app_context():
+        pool = db.engine.pool
+
+    # New connections are rare once the pool is warm, so logging here
+    # tracks pool growth (for sizing) without touching each request
+    @event.listens_for(pool, "connect")
+    def log_pool_status(dbapi_connection, connection_record):
+        app.logger.info("Opened database connection; %s", pool.status())
+
+
 def configure_logging(app):
     """Configure a rotating file logger and also stream to console."""
     # If there's already a handler, skip (so we don't double-add on re-import)
     if app.logger.handlers:
         return
 
+    level = app.config.get("LOG_LEVEL", "INFO")
+
     # Log format: timestamp, log level, file:line, message
     fmt = logging.Formatter(
         "[%(asctime)s] %(levelname)s in %(module)s:%(lineno)d: %(message)s"
@@ -111,7 +139,7 @@ def configure_logging(app):
     # -------------------------
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(fmt)
-    console_handler.setLevel(logging.INFO)
+    console_handler.setLevel(level)
     app.logger.addHandler(console_handler)
 
     # -------------------------
@@ -125,9 +153,9 @@ def configure_logging(app):
         backupCount=5,  # keep up to 5 old log files
     )
     file_handler.setFormatter(fmt)
-    file_handler.setLevel(logging.INFO)
+    file_handler.setLevel(level)
     app.logger.addHandler(file_handler)
 
     # Set the overall logging level
-    app.logger.setLevel(logging.INFO)
+    app.logger.setLevel(level)
     app.logger.info("Logging is configured.")
@@ -39,10 +39,15 @@ class User(db.Model):
         cascade="all, delete-orphan",
     )
 
+    @staticmethod
+    def hash_password(password: str) -> str:
+        """Validate a password and return its hash."""
+        validate_strong_password(password)
+        return generate_password_hash(password)
+
     def set_password(self, password: str) -> None:
         """Set the user's password after validating it."""
-        validate_strong_password(password)
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = self.hash_password(password)
 
     def check_password(self, password: str) -> bool:
         """Check if the password matches the stored hashed password."""
@@ -2,7 +2,7 @@
 
 from functools import wraps
 from flask_jwt_extended import get_jwt_identity, jwt_required
-from flask import current_app
+from flask import current_app, g
 from app.models import User
 from app.error_handlers import InvalidUsage
 from app.utils.blueprints import auth_blp
@@ -53,6 +53,8 @@ def protected(fn):
     @auth_blp.doc(security=[{"BearerAuth": []}])
     @jwt_required()
     def wrapper(*args, **kwargs):
+        # Resolve the identity once; views read it from g.user_id
+        g.user_id = get_jwt_identity()
         return fn(*args, **kwargs)
 
     return wrapper
@@ -0,0 +1,122 @@
+"""Redis-backed caching helpers for book listings and lookups."""
+
+from typing import Any, Dict, Optional
+
+from flask import current_app
+
+from app.extensions import cache, db
+from app.models import Book
+
+_BOOKS_LIST_VERSION_KEY = "books:list:version"
+
+
+def _books_list_version() -> int:
+    """Return the current book-list cache version (0 if unavailable)."""
+    try:
+        return cache.get(_BOOKS_LIST_VERSION_KEY) or 0
+    except Exception as e:
+        current_app.logger.warning(
+            "Book list cache version lookup failed: %s", str(e)
+        )
+        return 0
+
+
+def books_list_cache_key(filters: Dict[str, Any]) -> str:
+    """
+    Build the cache key for a book-list request from its parsed filters.
+
+    The key embeds a version counter that is bumped on every book write,
+    so stale pages become unreachable without a wildcard delete.
+    """
+    version = _books_list_version()
+    query = "&".join(
+        f"{key}={value}" for key, value in sorted(filters.items())
+    )
+    return f"books:list:v{version}:{query}"
+
+
+def get_cached_books_list(key: str) -> Optional[str]:
+    """Return the cached JSON body for `key`, or None on miss/failure."""
+    try:
+        return cache.get(key)
+    except Exception as e:
+        current_app.logger.warning(
+            "Book list cache read failed for key=%s: %s", key, str(e)
+        )
+        return None
+
+
+def set_cached_books_list(key: str, body: str) -> None:
+    """Store a serialized book-list response under `key`."""
+    try:
+        cache.set(
+            key, body, timeout=current_app.config["BOOKS_LIST_CACHE_TTL"]
+        )
+    except Exception as e:
+        current_app.logger.warning(
+            "Book list cache write failed for key=%s: %s", key, str(e)
+        )
+
+
+def invalidate_books_list() -> None:
+    """Invalidate every cached book-list page by bumping the version."""
+    try:
+        cache.cache.inc(_BOOKS_LIST_VERSION_KEY)
+    except Exception as e:
+        current_app.logger.warning(
+            "Book list cache invalidation failed: %s", str(e)
+        )
+
+
+def _book_meta_key(book_id: int) -> str:
+    """Return the cache key for a book's cart-relevant fields."""
+    return f"book:{book_id}:meta"
+
+
+def get_book_meta(book_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Return {"is_active", "stock", "price"} for a book, or None if missing.
+
+    Served from the cache when possible. Stock may lag by up to
+    BOOK_META_CACHE_TTL seconds, which is acceptable for the advisory
+    cart checks that use it: placing an order re-validates against the
+    database.
+    """
+    key = _book_meta_key(book_id)
+    try:
+        meta = cache.get(key)
+    except Exception as e:
+        current_app.logger.warning(
+            "Book meta cache read failed for key=%s: %s", key, str(e)
+        )
+        meta = None
+    if meta is not None:
+        return meta
+
+    book = db.session.get(Book, book_id)
+    if book is None:
+        return None
+
+    meta = {
+        "is_active": book.is_active,
+        "stock": book.stock,
+        "price": book.price,
+    }
+    try:
+        cache.set(key, meta, timeout=current_app.config["BOOK_META_CACHE_TTL"])
+    except Exception as e:
+        current_app.logger.warning(
+            "Book meta cache write failed for key=%s: %s", key, str(e)
+        )
+    return meta
+
+
+def invalidate_book_meta(book_id: int) -> None:
+    """Drop the cached lookup fields for a book after it changes."""
+    key = _book_meta_key(book_id)
+    try:
+        cache.delete(key)
+    except Exception as e:
+        current_app.logger.warning(
+            "Book meta cache invalidation failed for key=%s: %s", key, str(e)
+        )
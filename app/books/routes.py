@@ -1,23 +1,36 @@
 """Define REST endpoints for book and review operations."""
 
-from flask import current_app, request
+import logging
+
+from flask import Response, current_app, request
 from flask_jwt_extended import get_jwt_identity
 from flask.views import MethodView
 from marshmallow import ValidationError
 from psycopg2 import errorcodes
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import joinedload, load_only
 
 from app.auth.permissions import admin_required, protected
 from app.books.ai_service import generate_summary
+from app.books.cache import (
+    books_list_cache_key,
+    get_cached_books_list,
+    invalidate_book_meta,
+    invalidate_books_list,
+    set_cached_books_list,
+)
 from app.books.schemas import (
-    book_list_schema,
     inactive_book_list_schema,
+    paginated_books_response_schema,
+    BookFilterSchema,
     BookSummaryResponseWrapper,
     PaginatedBooksResponseWrapper,
     BookDataSchema,
     BookDetailsSchema,
     BookDataResponseWrapper,
     ReviewCreateSchema,
+    ReviewQuerySchema,
     ReviewsListResponseWrapper,
     ReviewResponseWrapper,
     CategoriesListResponseWrapper,
@@ -26,6 +39,7 @@ from app.error_handlers import InvalidUsage
 from app.extensions import db
 from app.models import Book, Category, Review
 from app.utils.blueprints import books_blp
+from app.utils.pagination import paginate_with_count
 
 
 @books_blp.route("/categories")
@@ -71,45 +85,53 @@ class CategoryResource(MethodView):
 class BookStoreResource(MethodView):
     """Resource for managing book store operations."""
 
-    @book_list_schema
+    @books_blp.arguments(BookFilterSchema, location="query")
     @books_blp.response(200, PaginatedBooksResponseWrapper)
     @protected
-    def get(self):
+    def get(self, filters):
         """Filter list of books."""
         user_id = get_jwt_identity()
         current_app.logger.info(
             "User (user_id=%s) requested book list with filters %s",
             user_id,
-            request.args.to_dict(),
+            filters,
         )
 
         try:
-            query = Book.query.filter(Book.is_active.is_(True))
+            # Serve the serialized page straight from cache when possible
+            cache_key = books_list_cache_key(filters)
+            cached_body = get_cached_books_list(cache_key)
+            if cached_body is not None:
+                current_app.logger.info(
+                    "Served book list from cache for user_id=%s", user_id
+                )
+                return Response(cached_body, mimetype="application/json")
+
+            query = select(Book).where(Book.is_active.is_(True))
 
             # Filters
-            title = request.args.get("title", type=str)
-            author = request.args.get("author", type=str)
-            category_id = request.args.get("category_id", type=int)
-            min_price = request.args.get("min_price", type=float)
-            max_price = request.args.get("max_price", type=float)
+            title = filters.get("title")
+            author = filters.get("author")
+            category_id = filters.get("category_id")
+            min_price = filters.get("min_price")
+            max_price = filters.get("max_price")
 
             if title:
-                query = query.filter(Book.title.ilike(f"%{title}%"))
+                query = query.where(Book.title.ilike(f"%{title}%"))
             if author:
-                query = query.filter(Book.author.ilike(f"%{author}%"))
+                query = query.where(Book.author.ilike(f"%{author}%"))
             if category_id:
-                query = query.filter(Book.category_id == category_id)
+                query = query.where(Book.category_id == category_id)
             if min_price is not None:
-                query = query.filter(Book.price >= min_price)
+                query = query.where(Book.price >= min_price)
             if max_price is not None:
-                query = query.filter(Book.price <= max_price)
+                query = query.where(Book.price <= max_price)
 
-            # Pagination
-            page = request.args.get("page", default=1, type=int)
-            per_page = request.args.get("per_page", default=10, type=int)
-
-            paginated = query.order_by(Book.created_at.desc()).paginate(
-                page=page, per_page=per_page, error_out=False
+            # Pagination; the total comes back with the page rows
+            paginated = paginate_with_count(
+                query.order_by(Book.created_at.desc()),
+                page=filters["page"],
+                per_page=filters["per_page"],
             )
 
             response_payload = {
@@ -133,7 +155,11 @@ class BookStoreResource(MethodView):
                 user_id,
             )
 
-            return response_payload
+            body = current_app.json.dumps(
+                paginated_books_response_schema.dump(response_payload)
+            )
+            set_cached_books_list(cache_key, body)
+            return Response(body, mimetype="application/json")
 
         except SQLAlchemyError as db_err:
             current_app.logger.error(
@@ -169,7 +195,8 @@ class BookStoreResource(MethodView):
             title,
         )
 
-        current_app.logger.debug("Validated book data: %s", validated_data)
+        if current_app.logger.isEnabledFor(logging.DEBUG):
+            current_app.logger.debug("Validated book data: %s", validated_data)
         book = Book(**validated_data)
         try:
             db.session.add(book)
@@ -238,6 +265,7 @@ class BookStoreResource(MethodView):
             )
             raise InvalidUsage("Internal server error.", status_code=500)
 
+        invalidate_books_list()
         current_app.logger.info("Book created successfully: book=%s", book)
 
         return {
@@ -261,7 +289,7 @@ class BooksResource(MethodView):
         )
 
         try:
-            book = Book.query.get(book_id)
+            book = db.session.get(Book, book_id)
 
             if not book or not book.is_active:
                 current_app.logger.warning(
@@ -316,7 +344,7 @@ class BooksResource(MethodView):
 
         try:
             # 1) Fetch book manually, return JSON 404 if missing
-            book = Book.query.get(book_id)
+            book = db.session.get(Book, book_id)
             if not book:
                 current_app.logger.warning(
                     "Book not found when attempting update: book_id=%s",
@@ -370,6 +398,8 @@ class BooksResource(MethodView):
 
             # 5) Commit changes
             db.session.commit()
+            invalidate_books_list()
+            invalidate_book_meta(book_id)
 
             current_app.logger.info(
                 "Book updated successfully: book_id=%s by admin user_id=%s",
@@ -457,7 +487,7 @@ class BooksResource(MethodView):
 
         try:
             # 1) Fetch the book
-            book = Book.query.get(book_id)
+            book = db.session.get(Book, book_id)
             if not book:
                 current_app.logger.warning(
                     "Book not found for deactivation: book_id=%s", book_id
@@ -478,6 +508,8 @@ class BooksResource(MethodView):
             # 3) Soft‐delete
             book.is_active = False
             db.session.commit()
+            invalidate_books_list()
+            invalidate_book_meta(book_id)
 
             current_app.logger.info(
                 "Book deactivated successfully: book_id=%s", book_id
@@ -521,10 +553,11 @@ class BooksResource(MethodView):
 class ReviewResource(MethodView):
     """Resource for managing book reviews."""
 
+    @books_blp.arguments(ReviewQuerySchema, location="query")
     @books_blp.response(200, ReviewsListResponseWrapper)
     @protected
-    def get(self, book_id):
-        """List reviews for a book."""
+    def get(self, pagination, book_id):
+        """List reviews for a book (paginated)."""
         user_id = get_jwt_identity()
         current_app.logger.info(
             "User (user_id=%s) requested reviews for book_id=%s",
@@ -533,24 +566,47 @@ class ReviewResource(MethodView):
         )
 
         try:
-            # 1) Fetch the book
-            book = Book.query.get(book_id)
-            if not book:
+            # 1) Check the book exists without loading it (or its reviews)
+            book_exists = (
+                db.session.query(Book.id).filter_by(id=book_id).scalar()
+                is not None
+            )
+            if not book_exists:
                 current_app.logger.warning(
                     "Book not found when listing reviews: book_id=%s", book_id
                 )
                 raise InvalidUsage("Book not found.", status_code=404)
 
-            # 2) Return all reviews for that book
-            reviews = book.reviews or []
+            # 2) Return one page of reviews for that book, newest first,
+            #    with each reviewer loaded in the same query
+            #    (id breaks created_at ties so pages never overlap)
+            paginated = paginate_with_count(
+                select(Review)
+                .options(joinedload(Review.user))
+                .where(Review.book_id == book_id)
+                .order_by(Review.created_at.desc(), Review.id.desc()),
+                page=pagination["page"],
+                per_page=pagination["per_page"],
+            )
+
             current_app.logger.info(
-                "Retrieved %d reviews for book_id=%s", len(reviews), book_id
+                "Retrieved %d reviews (page %d of %d) for book_id=%s",
+                len(paginated.items),
+                paginated.page,
+                paginated.pages,
+                book_id,
             )
 
             return {
                 "status": "success",
                 "message": "Reviews retrieved successfully.",
-                "data": reviews,
+                "data": {
+                    "items": paginated.items,
+                    "page": paginated.page,
+                    "pages": paginated.pages,
+                    "total": paginated.total,
+                    "per_page": paginated.per_page,
+                },
             }
 
         except InvalidUsage:
@@ -595,7 +651,10 @@ class ReviewResource(MethodView):
 
         try:
             # 1) Fetch the book. Return 404 JSON if not found or inactive.
-            book = Book.query.get(book_id)
+            #    Only is_active is needed, so skip the remaining columns.
+            book = db.session.get(
+                Book, book_id, options=[load_only(Book.is_active)]
+            )
             if not book or not book.is_active:
                 current_app.logger.warning(
                     "Book not found or inactive when "
@@ -706,7 +765,7 @@ class BookSummaryResource(MethodView):
 
         try:
             # 1) Fetch book; 404 if missing or inactive
-            book = Book.query.get(book_id)
+            book = db.session.get(Book, book_id)
             if not book or not book.is_active:
                 current_app.logger.warning(
                     "Book not found or inactive for summary: book_id=%s",
@@ -786,14 +845,16 @@ class InactiveBooksResource(MethodView):
         )
 
         try:
-            query = Book.query.filter(Book.is_active.is_(False))
+            query = select(Book).where(Book.is_active.is_(False))
 
             # Pagination params
             page = request.args.get("page", default=1, type=int)
             per_page = request.args.get("per_page", default=10, type=int)
 
-            paginated = query.order_by(Book.created_at.desc()).paginate(
-                page=page, per_page=per_page, error_out=False
+            paginated = paginate_with_count(
+                query.order_by(Book.created_at.desc()),
+                page=page,
+                per_page=per_page,
             )
 
             inactive_books = paginated.items
@@ -1,6 +1,6 @@
 """Define Marshmallow schemas for books, categories, and reviews."""
 
-from marshmallow import Schema, fields
+from marshmallow import Schema, fields, validate
 from app.utils.common_schema import StandardResponseSchema
 from app.utils.validations import validate_rating
 from app.utils.blueprints import books_blp
@@ -75,6 +75,28 @@ class PaginatedBooksResponseWrapper(StandardResponseSchema):
     data = fields.Nested(PaginatedBooksSchema, required=True)
 
 
+class BookFilterSchema(Schema):
+    """Query-string filters and pagination for the book list."""
+
+    title = fields.String(metadata={"description": "Filter by book title"})
+    author = fields.String(metadata={"description": "Filter by author"})
+    category_id = fields.Integer(
+        metadata={"description": "Filter by category"}
+    )
+    min_price = fields.Float(metadata={"description": "Minimum price"})
+    max_price = fields.Float(metadata={"description": "Maximum price"})
+    page = fields.Integer(
+        load_default=1,
+        validate=validate.Range(min=1),
+        metadata={"description": "Page number"},
+    )
+    per_page = fields.Integer(
+        load_default=10,
+        validate=validate.Range(min=1, max=100),
+        metadata={"description": "Items per page"},
+    )
+
+
 class BookSummarySchema(Schema):
     """Marshmallow schema for a book summary (AI-generated summaries)."""
 
@@ -121,10 +143,35 @@ class ReviewResponseWrapper(StandardResponseSchema):
     data = fields.Nested(ReviewDataSchema, required=True)
 
 
+class ReviewQuerySchema(Schema):
+    """Query-string pagination for a book's review list."""
+
+    page = fields.Integer(
+        load_default=1,
+        validate=validate.Range(min=1),
+        metadata={"description": "Page number"},
+    )
+    per_page = fields.Integer(
+        load_default=10,
+        validate=validate.Range(min=1, max=100),
+        metadata={"description": "Items per page"},
+    )
+
+
+class PaginatedReviewsSchema(Schema):
+    """Schema for paginated review responses."""
+
+    items = fields.List(fields.Nested(ReviewReadSchema), required=True)
+    page = fields.Int(required=True)
+    pages = fields.Int(required=True)
+    total = fields.Int(required=True)
+    per_page = fields.Int(required=True)
+
+
 class ReviewsListResponseWrapper(StandardResponseSchema):
-    """Wrap a list of reviews in the standard envelope."""
+    """Wrap a paginated list of reviews in the standard envelope."""
 
-    data = fields.List(fields.Nested(ReviewReadSchema), required=True)
+    data = fields.Nested(PaginatedReviewsSchema, required=True)
 
 
 class CategoriesListResponseWrapper(StandardResponseSchema):
@@ -133,29 +180,12 @@ class CategoriesListResponseWrapper(StandardResponseSchema):
     data = fields.List(fields.Nested(CategorySchema), required=True)
 
 
-book_list_schema = books_blp.doc(
-    parameters=[
-        {
-            "name": "title",
-            "in": "query",
-            "description": "Filter by book title",
-        },
-        {"name": "author", "in": "query", "description": "Filter by author"},
-        {
-            "name": "category_id",
-            "in": "query",
-            "description": "Filter by category",
-        },
-        {"name": "min_price", "in": "query", "description": "Minimum price"},
-        {"name": "max_price", "in": "query", "description": "Maximum price"},
-        {"name": "page", "in": "query", "description": "Page number"},
-        {"name": "per_page", "in": "query", "description": "Items per page"},
-    ]
-)
-
 inactive_book_list_schema = books_blp.doc(
     parameters=[
         {"name": "page", "in": "query", "description": "Page number"},
         {"name": "per_page", "in": "query", "description": "Items per page"},
     ]
 )
+
+# Built once for views that dump their own response (to cache the body)
+paginated_books_response_schema = PaginatedBooksResponseWrapper()
@@ -1,8 +1,9 @@
 """Define configuration classes for different environments."""
+import functools
 import os
 from datetime import timedelta
 from app.error_handlers import InvalidUsage
-from typing import List
+from typing import Any, Dict, List, Tuple
 
 
 class Config:
@@ -15,6 +16,7 @@ class Config:
     DEBUG: bool = os.getenv("DEBUG", "False").lower() in ["true", "1"]
     TESTING: bool = os.getenv("TESTING", "False").lower() in ["true", "1"]
     ENV: str = os.getenv("ENV", "production")
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO").upper()
 
     SECRET_KEY: str = os.getenv("SECRET_KEY")
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
@@ -25,9 +27,42 @@ class Config:
 
     SQLALCHEMY_DATABASE_URI: str = os.getenv("DATABASE_URL")
     SQLALCHEMY_TRACK_MODIFICATIONS: bool = False
+    # Ping pooled connections before use so a database restart surfaces
+    # as a transparent reconnect rather than a failed request
+    SQLALCHEMY_ENGINE_OPTIONS: Dict[str, Any] = {
+        "pool_pre_ping": True,
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "20")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "40")),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
 
     SOCKETIO_MESSAGE_QUEUE: str = os.getenv("RABBITMQ_URL")
     RABBITMQ_URL: str = SOCKETIO_MESSAGE_QUEUE
+    # Order events waiting for the background publisher; beyond this,
+    # new events are dropped (and logged) rather than blocking requests
+    ORDER_EVENT_QUEUE_SIZE: int = int(
+        os.getenv("ORDER_EVENT_QUEUE_SIZE", "10000")
+    )
+    # Heartbeat interval, and how long a publish may stay blocked by a
+    # broker resource alarm before the connection is dropped (seconds)
+    RABBITMQ_HEARTBEAT: int = int(os.getenv("RABBITMQ_HEARTBEAT", "30"))
+    RABBITMQ_BLOCKED_CONNECTION_TIMEOUT: int = int(
+        os.getenv("RABBITMQ_BLOCKED_CONNECTION_TIMEOUT", "60")
+    )
+    # Publish every order event persistent; by default only the events
+    # the inventory consumer acts on (paid/cancelled/refunded) are
+    RABBIT_PERSISTENT_EVENTS: bool = os.getenv(
+        "RABBIT_PERSISTENT_EVENTS", "False"
+    ).lower() in ["true", "1"]
+
+    # Redis-backed response cache; falls back to a no-op cache when unset
+    CACHE_REDIS_URL: str = os.getenv("REDIS_URL")
+    CACHE_TYPE: str = "RedisCache" if CACHE_REDIS_URL else "NullCache"
+    CACHE_NO_NULL_WARNING: bool = True
+    CACHE_DEFAULT_TIMEOUT: int = 60
+    BOOKS_LIST_CACHE_TTL: int = int(os.getenv("BOOKS_LIST_CACHE_TTL", "30"))
+    BOOK_META_CACHE_TTL: int = int(os.getenv("BOOK_META_CACHE_TTL", "60"))
+    ORDERS_LIST_CACHE_TTL: int = int(os.getenv("ORDERS_LIST_CACHE_TTL", "60"))
 
     API_TITLE: str = "Bookstore Backend API"
     API_VERSION: str = "1.0"
@@ -38,15 +73,19 @@ class Config:
         "https://cdn.jsdelivr.net/npm/swagger-ui-dist/"
     )
 
+    # (environment variable, config attribute) pairs that must be set;
+    # lowercase so app.config.from_object() does not copy it
+    _required_vars: Tuple[Tuple[str, str], ...] = (
+        ("SECRET_KEY", "SECRET_KEY"),
+        ("JWT_SECRET_KEY", "JWT_SECRET_KEY"),
+        ("DATABASE_URL", "SQLALCHEMY_DATABASE_URI"),
+    )
+
     def __init__(self):
         """Raise if required environment variables are missing."""
-        required_vars = {
-            "SECRET_KEY": self.SECRET_KEY,
-            "JWT_SECRET_KEY": self.JWT_SECRET_KEY,
-            "DATABASE_URL": self.SQLALCHEMY_DATABASE_URI,
-        }
-
-        missing = [k for k, v in required_vars.items() if not v]
+        missing = [
+            env for env, attr in self._required_vars if not getattr(self, attr)
+        ]
         if missing:
             raise InvalidUsage(
                 message="Missing required environment "
@@ -75,6 +114,7 @@ class ProductionConfig(Config):
 
     DEBUG: bool = False
     ENV: str = "production"
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "WARNING").upper()
 
 
 class InventoryConfig:
@@ -83,21 +123,51 @@ class InventoryConfig:
     @staticmethod
     def init_app(app):
         """Set config from environment and validate."""
-        app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get("DATABASE_URL")
-        app.config["RABBITMQ_URL"] = os.environ.get("RABBITMQ_URL")
-        app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY")
-        app.config["JWT_SECRET_KEY"] = os.environ.get("JWT_SECRET_KEY")
+        if app.config.get("INVENTORY_CONFIG_LOADED"):
+            return
+
+        db_url = os.environ.get("DATABASE_URL")
+        rabbitmq_url = os.environ.get("RABBITMQ_URL")
+        secret_key = os.environ.get("SECRET_KEY")
+        jwt_secret_key = os.environ.get("JWT_SECRET_KEY")
+
+        app.config["SQLALCHEMY_DATABASE_URI"] = db_url
+        app.config["RABBITMQ_URL"] = rabbitmq_url
+        app.config["SECRET_KEY"] = secret_key
+        app.config["JWT_SECRET_KEY"] = jwt_secret_key
 
         # Validate all are present
-        required_vars = {
-            "DATABASE_URL": app.config["SQLALCHEMY_DATABASE_URI"],
-            "RABBITMQ_URL": app.config["RABBITMQ_URL"],
-            "SECRET_KEY": app.config["SECRET_KEY"],
-            "JWT_SECRET_KEY": app.config["JWT_SECRET_KEY"],
-        }
-        missing = [k for k, v in required_vars.items() if not v]
+        missing = [
+            name
+            for name, value in (
+                ("DATABASE_URL", db_url),
+                ("RABBITMQ_URL", rabbitmq_url),
+                ("SECRET_KEY", secret_key),
+                ("JWT_SECRET_KEY", jwt_secret_key),
+            )
+            if not value
+        ]
         if missing:
             raise InvalidUsage(
                 f"Missing required env variables: {', '.join(missing)}",
                 status_code=500,
             )
+        app.config["INVENTORY_CONFIG_LOADED"] = True
+
+
+_CONFIGS = {
+    "development": DevelopmentConfig,
+    "testing": TestingConfig,
+    "production": ProductionConfig,
+}
+
+
+@functools.lru_cache(maxsize=None)
+def get_config(name: str) -> Config:
+    """
+    Return the validated config instance for `name`.
+
+    Unknown names fall back to production. Instances are memoized so the
+    required-variable check runs once per process and environment.
+    """
+    return _CONFIGS.get(name, ProductionConfig)()
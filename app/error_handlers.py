@@ -6,7 +6,8 @@ Flask-Smorest, etc.
 """
 from typing import Any, Dict, Optional, Tuple
 
-from flask import Flask, Response, jsonify
+import orjson
+from flask import Flask, Response, current_app, jsonify
 from werkzeug.exceptions import HTTPException
 
 
@@ -48,6 +49,53 @@ class InvalidUsage(Exception):
         }
 
 
+def handle_invalid_usage(error: InvalidUsage) -> Response:
+    """
+    Handle InvalidUsage exceptions and return JSON response.
+
+    Args:
+        error (InvalidUsage): The custom exception that was raised.
+
+    Returns:
+        Response: A Flask JSON response containing the error message
+        and any payload, with the appropriate HTTP status code.
+    """
+    # Fall back to the app's encoder for types orjson cannot encode
+    # natively (e.g. Decimal), as jsonify did
+    return Response(
+        orjson.dumps(error.to_dict(), default=current_app.json.default),
+        status=error.status_code,
+        mimetype="application/json",
+    )
+
+
+def handle_http_exception(e: HTTPException) -> Tuple[Response, int]:
+    """Handle HTTPException errors (e.g., 404, 405)."""
+    return (
+        jsonify(
+            {
+                "status": "error",
+                "error": e.description,
+            }
+        ),
+        e.code,
+    )
+
+
+def handle_general_exception(e: Exception) -> Tuple[Response, int]:
+    """Handle uncaught exceptions not handled by other handlers."""
+    current_app.logger.exception(e)
+    return (
+        jsonify(
+            {
+                "status": "error",
+                "error": "Internal Server Error",
+            }
+        ),
+        500,
+    )
+
+
 def register_error_handlers(app: Flask) -> None:
     """
     Register custom error handlers for the Flask application.
@@ -60,46 +108,6 @@ def register_error_handlers(app: Flask) -> None:
     Args:
         app (Flask): The Flask application instance to register handlers with.
     """
-
-    @app.errorhandler(InvalidUsage)
-    def handle_invalid_usage(error: InvalidUsage) -> Response:
-        """
-        Handle InvalidUsage exceptions and return JSON response.
-
-        Args:
-            error (InvalidUsage): The custom exception that was raised.
-
-        Returns:
-            Response: A Flask JSON response containing the error message
-            and any payload, with the appropriate HTTP status code.
-        """
-        response: Response = jsonify(error.to_dict())
-        response.status_code = error.status_code
-        return response
-
-    @app.errorhandler(HTTPException)
-    def handle_http_exception(e: HTTPException) -> Tuple[Response, int]:
-        """Handle HTTPException errors (e.g., 404, 405)."""
-        return (
-            jsonify(
-                {
-                    "status": "error",
-                    "error": e.description,
-                }
-            ),
-            e.code,
-        )
-
-    @app.errorhandler(Exception)
-    def handle_general_exception(e: Exception) -> Tuple[Response, int]:
-        """Handle uncaught exceptions not handled by other handlers."""
-        app.logger.exception(e)
-        return (
-            jsonify(
-                {
-                    "status": "error",
-                    "error": "Internal Server Error",
-                }
-            ),
-            500,
-        )
+    app.register_error_handler(InvalidUsage, handle_invalid_usage)
+    app.register_error_handler(HTTPException, handle_http_exception)
+    app.register_error_handler(Exception, handle_general_exception)
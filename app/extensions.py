@@ -3,33 +3,87 @@ Initialize and provide instances of various Flask extensions.
 
 These extensions are configured and bound to the Flask application
 within the create_app factory function.
+
+db, jwt and cache are created eagerly. api, cors, migrate and socketio
+are heavy to import and only needed by the web app, so they are created
+on first attribute access (PEP 562). Processes such as the inventory
+consumer that only touch db never load them.
 """
 import os
+from typing import TYPE_CHECKING, Any, Callable, Dict
 
-from flask_cors import CORS
+from flask_caching import Cache
 from flask_jwt_extended import JWTManager
-from flask_migrate import Migrate
-from flask_smorest import Api
-from flask_socketio import SocketIO
 from flask_sqlalchemy import SQLAlchemy
 
+if TYPE_CHECKING:
+    from flask_cors import CORS
+    from flask_migrate import Migrate
+    from flask_smorest import Api
+    from flask_socketio import SocketIO
+
+    api: Api
+    cors: CORS
+    migrate: Migrate
+    socketio: SocketIO
+
 # Extensions for the Flask application typed and initialized here
 db: SQLAlchemy = SQLAlchemy()
 jwt: JWTManager = JWTManager()
-api: Api = Api()
-cors: CORS = CORS()
-migrate: Migrate = Migrate()
+cache: Cache = Cache()
 
-env = os.getenv("FLASK_ENV", "production")
 
-if env == "production":
-    socketio: SocketIO = SocketIO(
-        cors_allowed_origins="*",  # Allow CORS for WebSocket
-        async_mode="eventlet",  # Use eventlet for async support
-    )
-else:
-    socketio: SocketIO = SocketIO(
+def _create_api() -> "Api":
+    """Create the flask-smorest Api."""
+    from flask_smorest import Api
+
+    return Api()
+
+
+def _create_cors() -> "CORS":
+    """Create the CORS extension."""
+    from flask_cors import CORS
+
+    return CORS()
+
+
+def _create_migrate() -> "Migrate":
+    """Create the Flask-Migrate extension."""
+    from flask_migrate import Migrate
+
+    return Migrate()
+
+
+def _create_socketio() -> "SocketIO":
+    """Create the SocketIO server for the current environment."""
+    from flask_socketio import SocketIO
+
+    env = os.getenv("FLASK_ENV", "production")
+
+    if env == "production":
+        return SocketIO(
+            cors_allowed_origins="*",  # Allow CORS for WebSocket
+            async_mode="eventlet",  # Use eventlet for async support
+        )
+    return SocketIO(
         cors_allowed_origins="*",  # Allow CORS for WebSocket
         async_mode="threading",  # Use threading for async support
         #  in non-production
     )
+
+
+_LAZY_EXTENSIONS: Dict[str, Callable[[], Any]] = {
+    "api": _create_api,
+    "cors": _create_cors,
+    "migrate": _create_migrate,
+    "socketio": _create_socketio,
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Create a lazy extension on first access and cache it."""
+    factory = _LAZY_EXTENSIONS.get(name)
+    if factory is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    extension = globals()[name] = factory()
+    return extension
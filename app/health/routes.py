@@ -1,11 +1,12 @@
 """Define health‐check endpoints."""
 
-from flask import Blueprint, jsonify
+from flask import Response
 
-health_bp = Blueprint("health", __name__)
+# Serialized once; a fresh Response is still built per request because
+# after_request hooks (e.g. CORS) mutate response headers in place.
+_HEALTH_OK_BODY = b'{"status":"ok"}\n'
 
 
-@health_bp.route("/", strict_slashes=False, methods=["GET"])
 def health_check():
     """Return a JSON response indicating service health."""
-    return jsonify({"status": "ok"}), 200
+    return Response(_HEALTH_OK_BODY, status=200, mimetype="application/json")
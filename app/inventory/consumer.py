@@ -1,12 +1,16 @@
 """Inventory Service Consumer."""
 
-import json
+import functools
 import logging
+import orjson
 import os
 import pika
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
 from flask import Flask
+from sqlalchemy import case, select, update
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.config import InventoryConfig
@@ -25,198 +29,495 @@ with app.app_context():
 
 app.logger.setLevel(logging.INFO)
 
+# Bound once: the DB worker thread runs inside one long-lived app context
+logger = app.logger
+session = db.session
+
+PREFETCH_COUNT = 32
+# Flush batched acks after this many messages even if more are buffered
+ACK_BATCH_SIZE = 32
+HEARTBEAT_SECONDS = 30
+BLOCKED_CONNECTION_TIMEOUT_SECONDS = 300
+# Exponential backoff between reconnect attempts
+RECONNECT_DELAY_SECONDS = 1
+RECONNECT_MAX_DELAY_SECONDS = 30
+
+_books_table = Book.__table__
+
+
+def _lock_books(book_ids):
+    """Load and row-lock the given books in one query, keyed by id."""
+    if not book_ids:
+        return {}
+    rows = session.execute(
+        select(Book).where(Book.id.in_(book_ids)).with_for_update()
+    ).scalars()
+    return {book.id: book for book in rows}
+
+
+def _take_stock(qty_by_book):
+    """
+    Decrement stock for {book_id: qty} in one conditional UPDATE.
+
+    Only rows with enough stock match, so the check and the decrement are
+    atomic. Returns False if any book was missing or short; the caller
+    must roll back the rows that did match.
+    """
+    if not qty_by_book:
+        return True
+    qty = case(qty_by_book, value=_books_table.c.id)
+    result = session.execute(
+        update(_books_table)
+        .where(_books_table.c.id.in_(qty_by_book), _books_table.c.stock >= qty)
+        .values(stock=_books_table.c.stock - qty)
+    )
+    return result.rowcount == len(qty_by_book)
+
+
+def _log_stock_shortages(order_id, qty_by_book):
+    """Log each book that could not cover its quantity (failure path)."""
+    stock_by_book = dict(
+        session.execute(
+            select(_books_table.c.id, _books_table.c.stock).where(
+                _books_table.c.id.in_(qty_by_book)
+            )
+        ).all()
+    )
+    for book_id, qty in qty_by_book.items():
+        available = stock_by_book.get(book_id, 0)
+        if available < qty:
+            logger.error(
+                "Inventory: Insufficient stock for "
+                "book_id=%s (needed=%s, available=%s) in order_id=%s",
+                book_id,
+                qty,
+                available,
+                order_id,
+            )
+
+
+def _adjust_stock(deltas):
+    """Apply {book_id: delta} stock changes in a single UPDATE."""
+    if not deltas:
+        return
+    session.execute(
+        update(_books_table)
+        .where(_books_table.c.id.in_(deltas))
+        .values(
+            stock=_books_table.c.stock + case(deltas, value=_books_table.c.id)
+        )
+    )
+
 
 def handle_order_paid(ch, method, properties, body):
-    """Process 'order.paid' events."""
+    """
+    Process 'order.paid' events.
+
+    Return True when the message should be acked, False to leave it
+    unacked for redelivery.
+    """
     try:
-        data = json.loads(body)
+        data = orjson.loads(body)
         order_id = data.get("order_id")
         items = data.get("items", [])
-    except json.JSONDecodeError as e:
-        app.logger.error("Inventory: Invalid JSONin 'order.paid': %s", str(e))
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-        return
+    except orjson.JSONDecodeError as e:
+        logger.error("Inventory: Invalid JSONin 'order.paid': %s", str(e))
+        return True
     except Exception as e:
-        app.logger.error("Inventory: Error processing message: %s", str(e))
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-        return
+        logger.error("Inventory: Error processing message: %s", str(e))
+        return True
 
-    app.logger.info(
-        "Inventory: Received 'order.paid' for order_id=%s", order_id
-    )
+    logger.debug("Inventory: Received 'order.paid' for order_id=%s", order_id)
 
-    with app.app_context():
-        order = db.session.get(Order, order_id)
-        if not order:
-            app.logger.warning(
-                "Inventory: Order not found (order_id=%s)", order_id
-            )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+    order = session.get(Order, order_id)
+    if not order:
+        logger.warning("Inventory: Order not found (order_id=%s)", order_id)
+        return True
 
-        if order.inventory_processed:
-            app.logger.info(
-                "Inventory: Already processed for order_id=%s; skipping",
-                order_id,
-            )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
-        try:
-            app.logger.info(
+    if order.inventory_processed:
+        logger.debug(
+            "Inventory: Already processed for order_id=%s; skipping",
+            order_id,
+        )
+        return True
+    try:
+        # Formatting the full items list is costly; only do it when
+        # the record will actually be emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
                 "Inventory: Processing order_id=%s with items: %s",
                 order_id,
                 items,
             )
-            # 1) Pre-check: ensure all items have sufficient stock
-            for it in items:
-                book_id = it.get("book_id")
-                qty = it.get("quantity", 0)
-
-                book = db.session.get(Book, book_id)
-                if not book or book.stock < qty:
-                    app.logger.error(
-                        "Inventory: Insufficient stock for "
-                        "book_id=%s (needed=%s, available=%s) in order_id=%s",
-                        book_id,
-                        qty,
-                        getattr(book, "stock", 0),
-                        order_id,
-                    )
-                    return
-
-            # 2) All checks passed—safe to decrement
-            for it in items:
-                book_id = it.get("book_id")
-                qty = it.get("quantity", 0)
-
-                book = db.session.get(Book, book_id)
-                book.stock -= qty
-                db.session.add(book)
-
-            # Mark order as processed
-            order.inventory_processed = True
-            db.session.add(order)
-            db.session.commit()
-
-            app.logger.info(
-                "Inventory: Stock updated and "
-                "marked processed for order_id=%s",
-                order_id,
+        # 1) Check and decrement every book in one conditional UPDATE
+        qty_by_book = {}
+        for it in items:
+            book_id = it.get("book_id")
+            qty_by_book[book_id] = qty_by_book.get(book_id, 0) + it.get(
+                "quantity", 0
             )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
 
-        except SQLAlchemyError as db_err:
-            db.session.rollback()
-            app.logger.error(
-                "Inventory: Database error while processing order_id=%s: %s",
-                order_id,
-                str(db_err),
-            )
-            return
+        if not _take_stock(qty_by_book):
+            session.rollback()
+            _log_stock_shortages(order_id, qty_by_book)
+            return False
 
-        except Exception as ex:
-            db.session.rollback()
-            app.logger.error(
-                "Inventory: Unexpected error processing order_id=%s: %s",
-                order_id,
-                str(ex),
-            )
-            return
+        # Mark order as processed
+        order.inventory_processed = True
+        session.commit()
+
+        logger.info(
+            "Inventory: Stock updated and marked processed for order_id=%s",
+            order_id,
+        )
+        return True
+
+    except SQLAlchemyError as db_err:
+        session.rollback()
+        logger.error(
+            "Inventory: Database error while processing order_id=%s: %s",
+            order_id,
+            str(db_err),
+        )
+        return False
+
+    except Exception as ex:
+        session.rollback()
+        logger.error(
+            "Inventory: Unexpected error processing order_id=%s: %s",
+            order_id,
+            str(ex),
+        )
+        return False
 
 
 def handle_order_cancelled(ch, method, properties, body):
-    """Process 'order.cancelled' and 'order.refunded' events."""
+    """
+    Process 'order.cancelled' and 'order.refunded' events.
+
+    Return True when the message should be acked, False otherwise.
+    """
     try:
-        data = json.loads(body)
-    except json.JSONDecodeError as e:
-        app.logger.error(
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        logger.error(
             "Inventory: Invalid JSON in 'order.cancelled': %s", str(e)
         )
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-        return
+        return True
     except Exception as e:
-        app.logger.error("Inventory: Error processing message: %s", str(e))
-        ch.basic_ack(delivery_tag=method.delivery_tag)
-        return
+        logger.error("Inventory: Error processing message: %s", str(e))
+        return True
 
     order_id = data.get("order_id")
-    app.logger.info(
+    logger.debug(
         "Inventory: Received 'order.cancelled' for order_id=%s", order_id
     )
 
-    with app.app_context():
-        order = db.session.get(Order, order_id)
-        if not order:
-            app.logger.warning(
-                "Inventory: Order not found: order_id=%s", order_id
-            )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
+    order = session.get(Order, order_id)
+    if not order:
+        logger.warning("Inventory: Order not found: order_id=%s", order_id)
+        return True
+
+    # Only restock if we previously processed inventory
+    # and haven’t restocked yet
+    if not order.inventory_processed:
+        logger.debug(
+            "Inventory: order_id=%s was never processed; no restock needed",
+            order_id,
+        )
+        return True
 
-        # Only restock if we previously processed inventory
-        # and haven’t restocked yet
-        if not order.inventory_processed:
-            app.logger.info(
-                "Inventory: order_id=%s was "
-                "never processed; no restock needed",
-                order_id,
+    if order.inventory_restocked:
+        logger.debug(
+            "Inventory: Already restocked for order_id=%s; skipping",
+            order_id,
+        )
+        return True
+
+    # 1) Restock each item, locking all books in one query
+    try:
+        qty_by_book = {}
+        for it in data.get("items", []):
+            qty_by_book[it["book_id"]] = (
+                qty_by_book.get(it["book_id"], 0) + it["quantity"]
             )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
 
-        if order.inventory_restocked:
-            app.logger.info(
-                "Inventory: Already restocked for order_id=%s; skipping",
+        books = _lock_books(list(qty_by_book))
+        for book_id in qty_by_book.keys() - books.keys():
+            logger.warning(
+                "Inventory: Book not found for "
+                "restock: book_id=%s in order_id=%s",
+                book_id,
                 order_id,
             )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-            return
 
-        # 1) Restock each item
+        _adjust_stock(
+            {
+                book_id: qty
+                for book_id, qty in qty_by_book.items()
+                if book_id in books
+            }
+        )
+
+        # 2) Mark restocked
+        order.inventory_restocked = True
+        session.commit()
+
+        logger.info(
+            "Inventory: Restocked and marked restocked for order_id=%s",
+            order_id,
+        )
+        return True
+
+    except SQLAlchemyError as db_err:
+        session.rollback()
+        logger.error(
+            "Inventory: DB error while restocking for order_id=%s: %s",
+            order_id,
+            str(db_err),
+        )
+        return False
+
+    except Exception as ex:
+        session.rollback()
+        logger.error(
+            "Inventory: Unexpected error while "
+            "restocking for order_id=%s: %s",
+            order_id,
+            str(ex),
+        )
+        return False
+
+
+# (queue, routing keys, handler): each event type gets its own durable
+# queue and handler, so deliveries need no routing-key dispatch
+INVENTORY_QUEUES = (
+    ("inventory_paid_queue", ("order.paid",), handle_order_paid),
+    (
+        "inventory_cancelled_queue",
+        ("order.cancelled", "order.refunded"),
+        handle_order_cancelled,
+    ),
+)
+
+# Single queue used before the per-event split. It is unbound from the
+# exchange and drained so messages published before an upgrade are not
+# lost; it can be deleted once empty.
+LEGACY_QUEUE = "inventory_update_queue"
+LEGACY_ROUTING_KEYS = ("order.paid", "order.cancelled")
+LEGACY_HANDLERS = {
+    "order.paid": handle_order_paid,
+    "order.cancelled": handle_order_cancelled,
+}
+
+
+def handle_legacy_message(ch, method, properties, body):
+    """Route a delivery left on the legacy queue by its routing key."""
+    handler = LEGACY_HANDLERS.get(method.routing_key)
+    if handler is not None:
+        return handler(ch, method, properties, body)
+    logger.warning(
+        "Inventory: Received unknown routing_key=%s", method.routing_key
+    )
+    return True
+
+
+def _push_worker_app_context():
+    """Give the DB worker thread its own long-lived app context."""
+    app.app_context().push()
+
+
+class InventoryConsumer:
+    """
+    Consume order events on a pika SelectConnection.
+
+    The I/O loop only moves frames (and keeps heartbeats alive); database
+    work runs on a single worker thread, and its outcome is handed back
+    to the I/O loop with add_callback_threadsafe for acking.
+
+    Successful deliveries are acked in batches with multiple=True. A
+    multiple ack covers every earlier tag, so once a message has been
+    left unacked for redelivery, acks fall back to one per message.
+    """
+
+    def __init__(self, params):
+        """Store connection parameters and create the DB worker."""
+        self._params = params
+        self._connection = None
+        self._channel = None
+        self._stopping = False
+        self._consuming = False
+        # One worker keeps processing (and therefore ack) order intact
+        self._executor = ThreadPoolExecutor(
+            max_workers=1,
+            thread_name_prefix="inventory-db",
+            initializer=_push_worker_app_context,
+        )
+        self._in_flight = 0
+        self._last_tag = None
+        self._pending = 0
+        self._held = False
+
+    def run(self):
+        """
+        Connect and block in the I/O loop until the connection ends.
+
+        Returns a (should_reconnect, was_consuming) tuple: whether the
+        connection was lost rather than deliberately stopped, and
+        whether it got as far as consuming before it ended.
+        """
+        self._connection = pika.SelectConnection(
+            self._params,
+            on_open_callback=self._on_connection_open,
+            on_open_error_callback=self._on_connection_open_error,
+            on_close_callback=self._on_connection_closed,
+        )
         try:
-            for it in data.get("items", []):
-                book = db.session.get(Book, it["book_id"])
-                if not book:
-                    app.logger.warning(
-                        "Inventory: Book not found for "
-                        "restock: book_id=%s in order_id=%s",
-                        it["book_id"],
-                        order_id,
-                    )
-                    continue
-                book.stock += it["quantity"]
-                db.session.add(book)
-
-            # 2) Mark restocked
-            order.inventory_restocked = True
-            db.session.add(order)
-            db.session.commit()
-
-            app.logger.info(
-                "Inventory: Restocked and marked restocked for order_id=%s",
-                order_id,
+            self._connection.ioloop.start()
+        except KeyboardInterrupt:
+            logger.info("Inventory consumer interrupted; stopping.")
+            self.stop()
+            # Let the close handshake finish
+            self._connection.ioloop.start()
+        finally:
+            self._executor.shutdown(wait=True)
+        return not self._stopping, self._consuming
+
+    def stop(self):
+        """Flush pending acks and close the connection."""
+        self._stopping = True
+        if self._channel is not None and self._channel.is_open:
+            self._flush_acks()
+        if not (self._connection.is_closing or self._connection.is_closed):
+            self._connection.close()
+
+    def _on_connection_open(self, connection):
+        connection.channel(on_open_callback=self._on_channel_open)
+
+    def _on_connection_open_error(self, connection, err):
+        logger.error("Inventory: Could not connect to RabbitMQ: %s", err)
+        connection.ioloop.stop()
+
+    def _on_connection_closed(self, connection, reason):
+        if not self._stopping:
+            logger.warning("Inventory: RabbitMQ connection closed: %s", reason)
+        connection.ioloop.stop()
+
+    def _on_channel_open(self, channel):
+        self._channel = channel
+        channel.add_on_close_callback(self._on_channel_closed)
+        channel.exchange_declare(
+            exchange="order_events",
+            exchange_type="direct",
+            durable=True,
+            callback=self._on_exchange_declared,
+        )
+
+    def _on_channel_closed(self, channel, reason):
+        # Without a channel nothing can be consumed; drop the connection
+        # so start_consumer reconnects
+        if not self._stopping:
+            logger.warning("Inventory: RabbitMQ channel closed: %s", reason)
+        if not (self._connection.is_closing or self._connection.is_closed):
+            self._connection.close()
+
+    def _on_exchange_declared(self, _frame):
+        # Channel RPCs are queued and sent in order, so only the last
+        # one needs a completion callback
+        for queue, routing_keys, _handler in INVENTORY_QUEUES:
+            self._channel.queue_declare(queue=queue, durable=True)
+            for routing_key in routing_keys:
+                self._channel.queue_bind(
+                    queue=queue,
+                    exchange="order_events",
+                    routing_key=routing_key,
+                )
+
+        self._channel.queue_declare(queue=LEGACY_QUEUE, durable=True)
+        for routing_key in LEGACY_ROUTING_KEYS:
+            self._channel.queue_unbind(
+                queue=LEGACY_QUEUE,
+                exchange="order_events",
+                routing_key=routing_key,
             )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
 
-        except SQLAlchemyError as db_err:
-            db.session.rollback()
-            app.logger.error(
-                "Inventory: DB error while restocking for order_id=%s: %s",
-                order_id,
-                str(db_err),
+        self._channel.basic_qos(
+            prefetch_count=PREFETCH_COUNT, callback=self._on_qos_ok
+        )
+
+    def _on_qos_ok(self, _frame):
+        for queue, _routing_keys, handler in INVENTORY_QUEUES:
+            self._channel.basic_consume(
+                queue=queue,
+                on_message_callback=functools.partial(
+                    self._on_message, handler
+                ),
             )
+        self._channel.basic_consume(
+            queue=LEGACY_QUEUE,
+            on_message_callback=functools.partial(
+                self._on_message, handle_legacy_message
+            ),
+        )
+        self._consuming = True
+        logger.info(
+            "Inventory consumer started. Waiting for "
+            "'order.paid', 'order.cancelled' and "
+            "'order.refunded' events..."
+        )
+
+    def _on_message(self, handler, ch, method, properties, body):
+        """Hand a delivery to the DB worker (runs on the I/O loop)."""
+        self._in_flight += 1
+        self._executor.submit(
+            self._process, handler, ch, method, properties, body
+        )
+
+    def _process(self, handler, ch, method, properties, body):
+        """Run the handler on the worker thread and report back."""
+        ok = False
+        try:
+            ok = handler(ch, method, properties, body)
+        except Exception as e:
+            logger.error("Inventory: Error processing message: %s", str(e))
+        finally:
+            # Reset the shared session so no transaction or stale
+            # identity map carries over to the next message
+            session.close()
+        self._connection.ioloop.add_callback_threadsafe(
+            functools.partial(self._on_processed, method.delivery_tag, ok)
+        )
+
+    def _on_processed(self, delivery_tag, ok):
+        """Record a handler outcome and ack as needed (I/O loop)."""
+        self._in_flight -= 1
+        if not self._channel.is_open:
+            # Unacked deliveries are requeued by the broker
             return
 
-        except Exception as ex:
-            db.session.rollback()
-            app.logger.error(
-                "Inventory: Unexpected error while "
-                "restocking for order_id=%s: %s",
-                order_id,
-                str(ex),
-            )
+        if not ok:
+            self._flush_acks()
+            self._held = True
+            return
+
+        if self._held:
+            self._channel.basic_ack(delivery_tag=delivery_tag)
             return
 
+        self._last_tag = delivery_tag
+        self._pending += 1
+        # Ack right away once nothing is in flight so an idle consumer
+        # never sits on unacked messages
+        if self._pending >= ACK_BATCH_SIZE or self._in_flight == 0:
+            self._flush_acks()
+
+    def _flush_acks(self):
+        """Ack every pending delivery up to the last successful tag."""
+        if self._last_tag is not None:
+            self._channel.basic_ack(delivery_tag=self._last_tag, multiple=True)
+            self._last_tag = None
+            self._pending = 0
+
 
 def start_consumer():
     """Connect to RabbitMQ."""
@@ -224,61 +525,21 @@ def start_consumer():
     if not rabbit_url:
         raise RuntimeError("RABBITMQ_URL is not set in Config.")
 
+    # Parsed once and reused for every reconnect attempt
     params = pika.URLParameters(rabbit_url)
-    connection = pika.BlockingConnection(params)
-    channel = connection.channel()
-
-    channel.exchange_declare(
-        exchange="order_events", exchange_type="direct", durable=True
-    )
-
-    channel.queue_declare(queue="inventory_update_queue", durable=True)
-
-    channel.queue_bind(
-        queue="inventory_update_queue",
-        exchange="order_events",
-        routing_key="order.paid",
-    )
-
-    channel.queue_bind(
-        queue="inventory_update_queue",
-        exchange="order_events",
-        routing_key="order.cancelled",
-    )
-
-    app.logger.info(
-        "Inventory consumer started. Waiting for "
-        "'order.paid', 'order.cancelled' and "
-        "'order.refunded' events..."
-    )
-
-    channel.basic_qos(prefetch_count=1)
-
-    def unified_callback(ch, method, properties, body):
-        routing_key = method.routing_key
-        if routing_key == "order.paid":
-            handle_order_paid(ch, method, properties, body)
-        elif routing_key in ("order.cancelled", "order.refunded"):
-            handle_order_cancelled(ch, method, properties, body)
-        else:
-            app.logger.warning(
-                "Inventory: Received unknown routing_key=%s", routing_key
-            )
-            ch.basic_ack(delivery_tag=method.delivery_tag)
-
-    # Start consuming
-    channel.basic_consume(
-        queue="inventory_update_queue", on_message_callback=unified_callback
-    )
-
-    try:
-        channel.start_consuming()
-        app.logger.info("Inventory consumer is running...")
-    except KeyboardInterrupt:
-        app.logger.info("Inventory consumer interrupted; stopping.")
-        channel.stop_consuming()
-    finally:
-        connection.close()
+    params.heartbeat = HEARTBEAT_SECONDS
+    params.blocked_connection_timeout = BLOCKED_CONNECTION_TIMEOUT_SECONDS
+
+    delay = RECONNECT_DELAY_SECONDS
+    while True:
+        should_reconnect, was_consuming = InventoryConsumer(params).run()
+        if not should_reconnect:
+            break
+        if was_consuming:
+            delay = RECONNECT_DELAY_SECONDS
+        logger.warning("Inventory: Reconnecting to RabbitMQ in %ss", delay)
+        time.sleep(delay)
+        delay = min(delay * 2, RECONNECT_MAX_DELAY_SECONDS)
 
 
 if __name__ == "__main__":
@@ -3,3 +3,4 @@
 from app.auth.models import User  # noqa: F401
 from app.books.models import Book, Category, Review  # noqa: F401
 from app.orders.models import Order, OrderItem, CartItem  # noqa: F401
+from app.seed.models import SeedMeta  # noqa: F401
@@ -0,0 +1,48 @@
+"""Redis-backed caching helpers for per-user order listings."""
+
+from typing import Optional, Union
+
+from flask import current_app
+
+from app.extensions import cache
+
+
+def _orders_list_key(user_id: Union[int, str]) -> str:
+    """Return the cache key for a user's serialized order list."""
+    return f"orders:user:{user_id}:list"
+
+
+def get_cached_orders_list(user_id: Union[int, str]) -> Optional[str]:
+    """Return the cached JSON body of a user's orders, or None."""
+    key = _orders_list_key(user_id)
+    try:
+        return cache.get(key)
+    except Exception as e:
+        current_app.logger.warning(
+            "Order list cache read failed for key=%s: %s", key, str(e)
+        )
+        return None
+
+
+def set_cached_orders_list(user_id: Union[int, str], body: str) -> None:
+    """Store a user's serialized order list."""
+    key = _orders_list_key(user_id)
+    try:
+        cache.set(
+            key, body, timeout=current_app.config["ORDERS_LIST_CACHE_TTL"]
+        )
+    except Exception as e:
+        current_app.logger.warning(
+            "Order list cache write failed for key=%s: %s", key, str(e)
+        )
+
+
+def invalidate_orders_list(user_id: Union[int, str]) -> None:
+    """Drop a user's cached order list after one of their orders changes."""
+    key = _orders_list_key(user_id)
+    try:
+        cache.delete(key)
+    except Exception as e:
+        current_app.logger.warning(
+            "Order list cache invalidation failed for key=%s: %s", key, str(e)
+        )
@@ -10,7 +10,9 @@ from sqlalchemy import (
     Enum as SQLEnum,
     ForeignKey,
     CheckConstraint,
+    Index,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import relationship
 from app.extensions import db
@@ -34,8 +36,12 @@ class Order(db.Model):
         nullable=False,
         default=OrderStatus.PENDING,
     )
-    inventory_processed = Column(Boolean, nullable=False, default=False)
-    inventory_restocked = Column(Boolean, nullable=False, default=False)
+    inventory_processed = Column(
+        Boolean, nullable=False, default=False, server_default=text("FALSE")
+    )
+    inventory_restocked = Column(
+        Boolean, nullable=False, default=False, server_default=text("FALSE")
+    )
     total_amount = Column(Float, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=db.func.now())
 
@@ -44,6 +50,15 @@ class Order(db.Model):
         CheckConstraint(
             "total_amount >= 0", name="check_order_total_amount_non_negative"
         ),
+        # Small partial index over orders the inventory consumer has not
+        # processed yet
+        Index(
+            "ix_orders_pending_inv",
+            "id",
+            postgresql_where=text("NOT inventory_processed"),
+        ),
+        # Order history: WHERE user_id = ? ORDER BY created_at DESC
+        Index("ix_orders_user_created", "user_id", created_at.desc()),
     )
 
     # Relationships
@@ -79,6 +94,8 @@ class OrderItem(db.Model):
         CheckConstraint(
             "price_unit >= 0", name="check_order_item_price_non_negative"
         ),
+        # Loading Order.items (and their books) by order_id
+        Index("ix_order_items_order_book", "order_id", "book_id"),
     )
 
     # Relationships
@@ -1,15 +1,27 @@
 """Define REST endpoints for managing orders in the bookstore application."""
 
-from flask import current_app
-from flask_jwt_extended import get_jwt_identity
+import math
+from collections import defaultdict
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, Dict, Iterable, List
+
+from flask import Response, current_app, g
 from flask.views import MethodView
+from sqlalchemy import Numeric, cast, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 
-from app import socketio
 from app.auth.permissions import admin_required, protected
+from app.books.cache import get_book_meta
 from app.error_handlers import InvalidUsage
 from app.extensions import db
 from app.models import Order, OrderItem, Book, CartItem
+from app.orders.cache import (
+    get_cached_orders_list,
+    invalidate_orders_list,
+    set_cached_orders_list,
+)
 from app.orders.enums import OrderStatus
 from app.orders.services import publish_order_event
 from app.orders.schemas import (
@@ -20,8 +32,78 @@ from app.orders.schemas import (
     OrderResponseWrapper,
     OrdersListResponseWrapper,
     OrderStatusUpdateSchema,
+    orders_list_response_schema,
 )
 from app.utils.blueprints import orders_blp, cart_blp
+from app.websocket.emitter import emit_order_status
+
+# Flat order/item/book rows, one per order item (or one per empty order),
+# in exactly the columns the order schemas read
+_ORDER_ROWS = (
+    select(
+        Order.id,
+        Order.user_id,
+        Order.status,
+        Order.total_amount,
+        Order.created_at,
+        OrderItem.id.label("item_id"),
+        OrderItem.book_id,
+        OrderItem.quantity,
+        OrderItem.price_unit,
+        Book.title,
+        Book.author,
+    )
+    .outerjoin(OrderItem, OrderItem.order_id == Order.id)
+    .outerjoin(Book, Book.id == OrderItem.book_id)
+)
+
+# Item/book rows keyed by order_id, for loading the items of many orders
+# in a second query instead of repeating each order's columns per item
+_ORDER_ITEM_ROWS = select(
+    OrderItem.order_id,
+    OrderItem.id.label("item_id"),
+    OrderItem.book_id,
+    OrderItem.quantity,
+    OrderItem.price_unit,
+    Book.title,
+    Book.author,
+).outerjoin(Book, Book.id == OrderItem.book_id)
+
+
+def _order_item_data(row: Any) -> Dict[str, Any]:
+    """Shape an item row the way OrderItemReadSchema reads it."""
+    return {
+        "id": row.item_id,
+        "book_id": row.book_id,
+        "quantity": row.quantity,
+        "price_unit": row.price_unit,
+        "title": row.title,
+        "author": row.author,
+    }
+
+
+def _serialize_orders(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Group flat _ORDER_ROWS results into order dicts.
+
+    Rows must arrive with each order's items adjacent.
+    """
+    orders = []
+    for _, order_rows in groupby(rows, key=attrgetter("id")):
+        first = next(order_rows)
+        items = [] if first.item_id is None else [_order_item_data(first)]
+        items.extend(_order_item_data(row) for row in order_rows)
+        orders.append(
+            {
+                "id": first.id,
+                "user_id": first.user_id,
+                "status": first.status,
+                "total_amount": first.total_amount,
+                "created_at": first.created_at,
+                "items": items,
+            }
+        )
+    return orders
 
 
 @cart_blp.route("/")
@@ -32,39 +114,38 @@ class CartResource(MethodView):
     @protected
     def get(self):
         """List all cart items for the current user."""
-        user_id = get_jwt_identity()
-        current_app.logger.info(
+        user_id = g.user_id
+        current_app.logger.debug(
             "User (user_id=%s) requested cart contents", user_id
         )
 
         try:
-            # Query all CartItem rows for this user, joining Book for details
-            cart_items = (
-                db.session.query(CartItem)
-                .filter_by(user_id=user_id)
-                .join(Book)
-                .all()
-            )
-
-            items_list = []
-            total_amount = 0.0
-            for item in cart_items:
-                subtotal = item.quantity * item.book.price
-                total_amount += subtotal
-                items_list.append(
-                    {
-                        "cart_item_id": item.id,
-                        "book_id": item.book.id,
-                        "title": item.book.title,
-                        "author": item.book.author,
-                        "price": item.book.price,
-                        "quantity": item.quantity,
-                        "subtotal": float(round(subtotal, 2)),
-                        "added_at": item.added_at,
-                    }
+            # Fetch the cart lines with their book columns; the database
+            # computes each rounded subtotal and, through a window over
+            # all lines, the cart total on every row
+            line_total = CartItem.quantity * Book.price
+            rows = db.session.execute(
+                select(
+                    CartItem.id.label("cart_item_id"),
+                    Book.id.label("book_id"),
+                    Book.title,
+                    Book.author,
+                    Book.price,
+                    CartItem.quantity,
+                    func.round(cast(line_total, Numeric), 2).label("subtotal"),
+                    CartItem.added_at,
+                    func.round(
+                        cast(func.sum(line_total).over(), Numeric), 2
+                    ).label("total"),
                 )
+                .join(Book, Book.id == CartItem.book_id)
+                .where(CartItem.user_id == user_id)
+            ).all()
 
-            current_app.logger.info(
+            items_list = [row._asdict() for row in rows]
+            total_amount = rows[0].total if rows else 0.0
+
+            current_app.logger.debug(
                 "Found %d items in cart for user_id=%s; total_amount=%.2f",
                 len(items_list),
                 user_id,
@@ -76,7 +157,7 @@ class CartResource(MethodView):
                 "message": "Cart retrieved successfully.",
                 "data": {
                     "items": items_list,
-                    "total_amount": round(total_amount, 2),
+                    "total_amount": total_amount,
                 },
             }
 
@@ -108,7 +189,7 @@ class CartResource(MethodView):
     @protected
     def post(self, validated_data):
         """Add a book to the user's cart."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         book_id = validated_data["book_id"]
         quantity = validated_data["quantity"]
 
@@ -120,9 +201,9 @@ class CartResource(MethodView):
         )
 
         try:
-            # 1) Verify the book exists and is active
-            book = Book.query.get(book_id)
-            if not book or not book.is_active:
+            # 1) Verify the book exists and is active (cached lookup)
+            book = get_book_meta(book_id)
+            if not book or not book["is_active"]:
                 current_app.logger.warning(
                     "Book not found or inactive "
                     "when adding to cart: book_id=%s",
@@ -133,51 +214,53 @@ class CartResource(MethodView):
                     status_code=404,
                 )
 
-            # 2) Check if a CartItem already exists for this user & book
-            existing = CartItem.query.filter_by(
-                user_id=user_id, book_id=book_id
-            ).first()
-
-            total_requested = quantity
-            if existing:
-                total_requested += existing.quantity
-
-            if total_requested > book.stock:
+            # 2) Insert the cart line, or add to its quantity, in one
+            #    statement. The conflict update only applies while the
+            #    combined quantity stays within stock, so no row comes
+            #    back when the request would exceed it.
+            row = None
+            if quantity <= book["stock"]:
+                stmt = (
+                    pg_insert(CartItem)
+                    .values(
+                        user_id=user_id, book_id=book_id, quantity=quantity
+                    )
+                    .on_conflict_do_update(
+                        index_elements=[CartItem.user_id, CartItem.book_id],
+                        set_={"quantity": CartItem.quantity + quantity},
+                        where=CartItem.quantity + quantity <= book["stock"],
+                    )
+                    .returning(CartItem.id, CartItem.quantity)
+                )
+                row = db.session.execute(stmt).first()
+
+            if row is None:
+                in_cart = (
+                    db.session.query(CartItem.quantity)
+                    .filter_by(user_id=user_id, book_id=book_id)
+                    .scalar()
+                    or 0
+                )
                 current_app.logger.warning(
                     "Requested quantity (%s) exceeds "
                     "available stock (%s) for book_id=%s",
-                    total_requested,
-                    book.stock,
+                    in_cart + quantity,
+                    book["stock"],
                     book_id,
                 )
                 raise InvalidUsage(
-                    message=f"Only {book.stock} copies available. You "
-                    f"already have {existing.quantity if existing else 0} "
-                    "in your cart.",
+                    message=f"Only {book['stock']} copies available. You "
+                    f"already have {in_cart} in your cart.",
                     status_code=400,
                 )
 
-            if existing:
-                # Increase quantity
-                existing.quantity += quantity
-                current_app.logger.info(
-                    "Incremented quantity for existing cart_item_id=%s to %s",
-                    existing.id,
-                    existing.quantity,
-                )
-            else:
-                # Create a new CartItem
-                new_item = CartItem(
-                    user_id=user_id, book_id=book_id, quantity=quantity
-                )
-                db.session.add(new_item)
-                current_app.logger.info(
-                    "Created new cart_item for "
-                    "user_id=%s, book_id=%s, qty=%s",
-                    user_id,
-                    book_id,
-                    quantity,
-                )
+            current_app.logger.info(
+                "Upserted cart_item_id=%s for user_id=%s, book_id=%s; qty=%s",
+                row.id,
+                user_id,
+                book_id,
+                row.quantity,
+            )
 
             db.session.commit()
             return {
@@ -189,17 +272,6 @@ class CartResource(MethodView):
         except IntegrityError as ie:
             db.session.rollback()
             msg = str(getattr(ie, "orig", ie))
-            if "uix_user_book_cart" in msg.lower() or "unique" in msg.lower():
-                current_app.logger.warning(
-                    "Duplicate cart item prevented for user_id=%s, book_id=%s",
-                    user_id,
-                    book_id,
-                )
-                raise InvalidUsage(
-                    message="Item already in cart; quantity "
-                    "was incremented automatically.",
-                    status_code=400,
-                )
             current_app.logger.error(
                 "Integrity error adding to cart for user_id=%s: %s",
                 user_id,
@@ -242,7 +314,7 @@ class CartResource(MethodView):
     @protected
     def patch(self, validated_data):
         """Update quantity of a specific book in the cart."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         book_id = validated_data["book_id"]
         quantity = validated_data["quantity"]
 
@@ -272,8 +344,8 @@ class CartResource(MethodView):
             total_requested += cart_item.quantity
 
             # Check if the book exists and has enough stock
-            book = Book.query.get(book_id)
-            if not book or not book.is_active:
+            book = get_book_meta(book_id)
+            if not book or not book["is_active"]:
                 current_app.logger.warning(
                     "Book not found or inactive "
                     "when adding to cart: book_id=%s",
@@ -284,16 +356,16 @@ class CartResource(MethodView):
                     status_code=404,
                 )
 
-            if total_requested > book.stock:
+            if total_requested > book["stock"]:
                 current_app.logger.warning(
                     "Requested quantity (%s) exceeds "
                     "available stock (%s) for book_id=%s",
                     total_requested,
-                    book.stock,
+                    book["stock"],
                     book_id,
                 )
                 raise InvalidUsage(
-                    message=f"Only {book.stock} copies available. You "
+                    message=f"Only {book['stock']} copies available. You "
                     f"already have {cart_item.quantity if cart_item else 0} "
                     "in your cart.",
                     status_code=400,
@@ -364,7 +436,7 @@ class CartItemResource(MethodView):
     @protected
     def delete(self, cart_item_id):
         """Remove a book from the user's cart."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         current_app.logger.info(
             "User (user_id=%s) attempting to delete cart_item_id=%s",
             user_id,
@@ -445,7 +517,7 @@ class CartClearResource(MethodView):
     @protected
     def delete(self):
         """Clear all items from the current user's cart."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         current_app.logger.info(
             "User (user_id=%s) requested to clear the cart", user_id
         )
@@ -495,21 +567,38 @@ class OrdersResource(MethodView):
     @protected
     def post(self):
         """Place an order using the current user's cart."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         current_app.logger.info(
             "User (user_id=%s) is attempting to place an order", user_id
         )
 
         try:
-            # 1) Fetch all CartItems for this user, joined with Book
-            cart_items = (
-                db.session.query(CartItem)
-                .filter_by(user_id=user_id)
-                .join(Book)
-                .all()
-            )
-
-            if not cart_items:
+            # 1) Clear the user's cart and read back the removed lines
+            #    with the book columns needed for validation, in one
+            #    statement (DELETE ... RETURNING in a CTE). The delete
+            #    locks the lines, so a concurrent checkout of the same
+            #    cart waits and then finds it empty. Any failure below
+            #    rolls the delete back
+            ordered = (
+                delete(CartItem)
+                .where(CartItem.user_id == user_id)
+                .returning(CartItem.book_id, CartItem.quantity)
+                .cte("ordered_lines")
+            )
+            cart_rows = db.session.execute(
+                select(
+                    ordered.c.book_id,
+                    ordered.c.quantity,
+                    Book.id.label("found_id"),
+                    Book.title,
+                    Book.author,
+                    Book.price,
+                    Book.stock,
+                    Book.is_active,
+                ).outerjoin(Book, Book.id == ordered.c.book_id)
+            ).all()
+
+            if not cart_rows:
                 current_app.logger.warning(
                     "Cart is empty for user_id=%s; cannot place order",
                     user_id,
@@ -519,127 +608,126 @@ class OrdersResource(MethodView):
                     status_code=400,
                 )
 
-            # 2) Validate each cart item and compute totals
-            total_amount = 0.0
+            # 2) Validate each cart line in memory and collect subtotals
+            subtotals = []
             order_items_data = []
-            for ci in cart_items:
-                book = ci.book
-                if not book or not book.is_active:
+            for row in cart_rows:
+                if row.found_id is None or not row.is_active:
                     current_app.logger.warning(
                         "Book not found or inactive in cart "
                         "for user_id=%s: book_id=%s",
                         user_id,
-                        ci.book_id,
+                        row.book_id,
                     )
                     raise InvalidUsage(
-                        message=f"Book (id={ci.book_id}) not "
+                        message=f"Book (id={row.book_id}) not "
                         "found or inactive.",
                         status_code=404,
                     )
 
-                if book.stock < ci.quantity:
+                if row.stock < row.quantity:
                     current_app.logger.warning(
                         "Insufficient stock for book_id=%s: "
                         "requested %s, available %s",
-                        book.id,
-                        ci.quantity,
-                        book.stock,
+                        row.book_id,
+                        row.quantity,
+                        row.stock,
                     )
                     raise InvalidUsage(
                         message=(
-                            f"Insufficient stock for '{book.title}'. "
-                            f"Requested {ci.quantity}, available {book.stock}."
+                            f"Insufficient stock for '{row.title}'. "
+                            f"Requested {row.quantity}, available {row.stock}."
                         ),
                         status_code=400,
                     )
 
-                price_unit = book.price
-                subtotal = price_unit * ci.quantity
-                total_amount += subtotal
+                price_unit = row.price
+                subtotals.append(price_unit * row.quantity)
 
                 order_items_data.append(
                     {
-                        "book_id": book.id,
-                        "quantity": ci.quantity,
+                        "book_id": row.book_id,
+                        "quantity": row.quantity,
                         "price_unit": price_unit,
+                        "title": row.title,
+                        "author": row.author,
                     }
                 )
 
-            # 3) Create the Order
+            # 3) Create the Order together with its OrderItems so the
+            #    unit of work inserts all items in one batched INSERT.
+            #    Stock is not touched here: the inventory consumer
+            #    decrements it in one bulk UPDATE when the order is paid
             new_order = Order(
                 user_id=user_id,
-                total_amount=round(total_amount, 2),  # ensure rounding
+                # Exact float sum, rounded once
+                total_amount=round(math.fsum(subtotals), 2),
+                items=[
+                    OrderItem(
+                        book_id=item_data["book_id"],
+                        quantity=item_data["quantity"],
+                        price_unit=item_data["price_unit"],
+                    )
+                    for item_data in order_items_data
+                ],
             )
             db.session.add(new_order)
-            db.session.flush()  # get new_order.id
-
-            # 4) Create each OrderItem (no stock update)
-            for item_data in order_items_data:
-                oi = OrderItem(
-                    order_id=new_order.id,
-                    book_id=item_data["book_id"],
-                    quantity=item_data["quantity"],
-                    price_unit=item_data["price_unit"],
-                )
-                db.session.add(oi)
 
-                #  testing rabbit async
-                # Reduce stock in the Book table
-                # Book.query.filter_by(id=item_data["book_id"]).update(
-                #     {"stock": Book.stock - item_data["quantity"]}
-                # )
-
-            # 5) Clear the user's cart
-            deleted_count = (
-                db.session.query(CartItem)
-                .filter_by(user_id=user_id)
-                .delete(synchronize_session=False)
-            )
-            if deleted_count > 0:
-                current_app.logger.info(
-                    "Cleared %d items from cart after "
-                    "placing order for user_id=%s",
-                    deleted_count,
-                    user_id,
-                )
+            # 4) Flush to get the generated ids, then build the response
+            #    from what is already in memory: the commit expires the
+            #    instances, and reloading them would cost another SELECT
+            db.session.flush()
+            order_id = new_order.id
+            order_data = {
+                "id": order_id,
+                "user_id": new_order.user_id,
+                "status": new_order.status,
+                "total_amount": new_order.total_amount,
+                "created_at": new_order.created_at,
+                "items": [
+                    {
+                        "id": item.id,
+                        "book_id": item.book_id,
+                        "quantity": item.quantity,
+                        "price_unit": item.price_unit,
+                        "title": item_data["title"],
+                        "author": item_data["author"],
+                    }
+                    for item, item_data in zip(
+                        new_order.items, order_items_data
+                    )
+                ],
+            }
 
-            # 6) Commit the entire transaction
-            #     (Order + OrderItems + CartItem deletions)
+            # 5) Commit the entire transaction
+            #     (CartItem deletions + Order + OrderItems)
             db.session.commit()
+            invalidate_orders_list(user_id)
             current_app.logger.info(
                 "Order placed successfully: order_id=%s for "
                 "user_id=%s; cleared %d cart items",
-                new_order.id,
+                order_id,
                 user_id,
-                deleted_count,
+                len(cart_rows),
             )
 
-            # 7) Notify via WebSocket
-            socketio.emit(
-                "order_status_update",
-                {
-                    "order_id": new_order.id,
-                    "status": OrderStatus.PENDING.value,
-                    "message": "Your order has been placed and is pending.",
-                },
-                room=f"user_{user_id}",
-                namespace="/api/ws/orders",
+            # 6) Notify via WebSocket
+            emit_order_status(
+                user_id,
+                order_id,
+                OrderStatus.PENDING,
+                "Your order has been placed and is pending.",
             )
             current_app.logger.info(
-                "WebSocket event emitted for order_id=%s with status %s",
-                new_order.id,
+                "WebSocket event queued for order_id=%s with status %s",
+                order_id,
                 OrderStatus.PENDING.value,
             )
 
-            # 7) Reload the order with its items for serialization
-            order = Order.query.options(
-                db.joinedload(Order.items).joinedload(OrderItem.book)
-            ).get(new_order.id)
-
             return {
                 "status": "success",
                 "message": "Order placed successfully.",
-                "data": order,
+                "data": order_data,
             }, 201
 
         except IntegrityError as ie:
@@ -668,6 +756,7 @@ class OrdersResource(MethodView):
             )
 
         except InvalidUsage:
+            db.session.rollback()  # Restore the cart
             raise  # Re-raise known 400/404
 
         except Exception as e:
@@ -686,28 +775,75 @@ class OrdersResource(MethodView):
     @protected
     def get(self):
         """List all orders placed by the current user."""
-        user_id = get_jwt_identity()
-        current_app.logger.info(
+        user_id = g.user_id
+        current_app.logger.debug(
             "User (user_id=%s) requested their orders", user_id
         )
 
         try:
-            orders = (
-                Order.query.filter_by(user_id=user_id)
-                .options(db.joinedload(Order.items).joinedload(OrderItem.book))
-                .order_by(Order.created_at.desc())
-                .all()
-            )
+            # Serve the serialized list straight from cache when possible
+            cached_body = get_cached_orders_list(user_id)
+            if cached_body is not None:
+                current_app.logger.debug(
+                    "Served order list from cache for user_id=%s", user_id
+                )
+                return Response(cached_body, mimetype="application/json")
+
+            # 1) The user's orders, newest first
+            order_rows = db.session.execute(
+                select(
+                    Order.id,
+                    Order.user_id,
+                    Order.status,
+                    Order.total_amount,
+                    Order.created_at,
+                )
+                .where(Order.user_id == user_id)
+                .order_by(Order.created_at.desc(), Order.id.desc())
+            ).all()
+
+            # 2) All of their items in one more query (selectin-style),
+            #    rather than a join that repeats order columns per item
+            items_by_order = defaultdict(list)
+            if order_rows:
+                item_rows = db.session.execute(
+                    _ORDER_ITEM_ROWS.join(
+                        Order, Order.id == OrderItem.order_id
+                    )
+                    .where(Order.user_id == user_id)
+                    .order_by(OrderItem.id)
+                    .execution_options(yield_per=200)
+                )
+                for row in item_rows:
+                    items_by_order[row.order_id].append(_order_item_data(row))
 
-            current_app.logger.info(
+            orders = [
+                {
+                    "id": row.id,
+                    "user_id": row.user_id,
+                    "status": row.status,
+                    "total_amount": row.total_amount,
+                    "created_at": row.created_at,
+                    "items": items_by_order[row.id],
+                }
+                for row in order_rows
+            ]
+
+            current_app.logger.debug(
                 "Found %d orders for user_id=%s", len(orders), user_id
             )
-            return {
+            response_payload = {
                 "status": "success",
                 "message": "Orders retrieved successfully.",
                 "data": orders,
             }
 
+            body = current_app.json.dumps(
+                orders_list_response_schema.dump(response_payload)
+            )
+            set_cached_orders_list(user_id, body)
+            return Response(body, mimetype="application/json")
+
         except SQLAlchemyError as db_err:
             current_app.logger.error(
                 "Database error listing orders for user_id=%s: %s",
@@ -740,21 +876,23 @@ class OrderDetailResource(MethodView):
     @protected
     def get(self, order_id):
         """Get detail of a single order (if it belongs to current user)."""
-        user_id = get_jwt_identity()
-        current_app.logger.info(
+        user_id = g.user_id
+        current_app.logger.debug(
             "User (user_id=%s) requested order details for order_id=%s",
             user_id,
             order_id,
         )
 
         try:
-            order = (
-                Order.query.filter_by(id=order_id, user_id=user_id)
-                .options(db.joinedload(Order.items).joinedload(OrderItem.book))
-                .first()
+            orders = _serialize_orders(
+                db.session.execute(
+                    _ORDER_ROWS.where(
+                        Order.id == order_id, Order.user_id == user_id
+                    ).order_by(OrderItem.id)
+                )
             )
 
-            if not order:
+            if not orders:
                 current_app.logger.warning(
                     "Order not found for user_id=%s: order_id=%s",
                     user_id,
@@ -762,7 +900,7 @@ class OrderDetailResource(MethodView):
                 )
                 raise InvalidUsage(message="Order not found.", status_code=404)
 
-            current_app.logger.info(
+            current_app.logger.debug(
                 "Order retrieved successfully: order_id=%s for user_id=%s",
                 order_id,
                 user_id,
@@ -770,7 +908,7 @@ class OrderDetailResource(MethodView):
             return {
                 "status": "success",
                 "message": "Order retrieved successfully.",
-                "data": order,
+                "data": orders[0],
             }
 
         except SQLAlchemyError as db_err:
@@ -811,7 +949,7 @@ class OrderCancelResource(MethodView):
     @protected
     def post(self, order_id):
         """Cancel an order if it is still pending."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         current_app.logger.info(
             "User (user_id=%s) requested cancellation of order_id=%s",
             user_id,
@@ -819,33 +957,55 @@ class OrderCancelResource(MethodView):
         )
 
         try:
-            # 1) Fetch the order and verify ownership
-            order = Order.query.filter_by(id=order_id, user_id=user_id).first()
-            if not order:
-                current_app.logger.warning(
-                    "Order not found or not owned by user_id=%s: order_id=%s",
-                    user_id,
-                    order_id,
+            # 1) Cancel in one statement: only the owner's PENDING order
+            #    matches, so ownership and status are checked atomically
+            order = db.session.execute(
+                update(Order)
+                .where(
+                    Order.id == order_id,
+                    Order.user_id == user_id,
+                    Order.status == OrderStatus.PENDING,
                 )
-                raise InvalidUsage(message="Order not found.", status_code=404)
+                .values(status=OrderStatus.CANCELLED)
+                .returning(
+                    Order.inventory_processed, Order.inventory_restocked
+                )
+                .execution_options(synchronize_session=False)
+            ).first()
+
+            # 2) Nothing updated: look up the status to tell a missing
+            #    order (404) from one that is no longer PENDING (400)
+            if order is None:
+                status = (
+                    db.session.query(Order.status)
+                    .filter_by(id=order_id, user_id=user_id)
+                    .scalar()
+                )
+                if status is None:
+                    current_app.logger.warning(
+                        "Order not found or not owned by "
+                        "user_id=%s: order_id=%s",
+                        user_id,
+                        order_id,
+                    )
+                    raise InvalidUsage(
+                        message="Order not found.", status_code=404
+                    )
 
-            # 2) Only PENDING orders can be cancelled by the user
-            if order.status != OrderStatus.PENDING:
                 current_app.logger.warning(
                     "Attempt to cancel non‐pending order_id=%s with status=%s",
                     order_id,
-                    order.status.value,
+                    status.value,
                 )
                 raise InvalidUsage(
                     message=f"Cannot cancel an order with "
-                    f"status '{order.status.value}'.",
+                    f"status '{status.value}'.",
                     status_code=400,
                 )
 
-            # 3) Perform cancellation
-            order.status = OrderStatus.CANCELLED
-            db.session.add(order)
+            # 3) Commit the cancellation
             db.session.commit()
+            invalidate_orders_list(user_id)
             current_app.logger.info(
                 "Order cancelled successfully: order_id=%s by user_id=%s",
                 order_id,
@@ -855,13 +1015,15 @@ class OrderCancelResource(MethodView):
             # 4) Publish RabbitMQ event "order.cancelled"
             if order.inventory_processed and not order.inventory_restocked:
                 items_for_message = [
-                    {"book_id": oi.book_id, "quantity": oi.quantity}
-                    for oi in order.items
+                    {"book_id": book_id, "quantity": quantity}
+                    for book_id, quantity in db.session.query(
+                        OrderItem.book_id, OrderItem.quantity
+                    ).filter_by(order_id=order_id)
                 ]
                 try:
                     publish_order_event(
-                        order_id=order.id,
-                        user_id=order.user_id,
+                        order_id=order_id,
+                        user_id=user_id,
                         items=items_for_message,
                         status=OrderStatus.CANCELLED,
                     )
@@ -878,18 +1040,14 @@ class OrderCancelResource(MethodView):
                     )
 
             # 5) Notify via WebSocket
-            socketio.emit(
-                "order_status_update",
-                {
-                    "order_id": order.id,
-                    "status": order.status.value,
-                    "message": "Your order has been cancelled successfully.",
-                },
-                room=f"user_{user_id}",
-                namespace="/api/ws/orders",
+            emit_order_status(
+                user_id,
+                order_id,
+                OrderStatus.CANCELLED,
+                "Your order has been cancelled successfully.",
             )
             current_app.logger.info(
-                "WebSocket notification sent for order_id=%s to user_id=%s",
+                "WebSocket notification queued for order_id=%s to user_id=%s",
                 order_id,
                 user_id,
             )
@@ -960,7 +1118,7 @@ class OrderPaymentResource(MethodView):
     @protected
     def post(self, order_id):
         """Confirm payment for a pending order."""
-        user_id = get_jwt_identity()
+        user_id = g.user_id
         current_app.logger.info(
             "User (user_id=%s) requested payment for order_id=%s",
             user_id,
@@ -992,9 +1150,21 @@ class OrderPaymentResource(MethodView):
                     status_code=400,
                 )
 
-            # 3) Update status → PAID
+            # 3) Update status → PAID, reading the items for the event
+            #    and the response in the same transaction
             order.status = OrderStatus.PAID
+            order_data = {
+                "id": order.id,
+                "user_id": order.user_id,
+                "status": order.status,
+                "total_amount": order.total_amount,
+                "created_at": order.created_at,
+            }
+            items = db.session.execute(
+                _ORDER_ITEM_ROWS.where(OrderItem.order_id == order_id)
+            ).all()
             db.session.commit()
+            invalidate_orders_list(user_id)
             current_app.logger.info(
                 "Order status updated to PAID: order_id=%s by user_id=%s",
                 order_id,
@@ -1004,12 +1174,12 @@ class OrderPaymentResource(MethodView):
             # 4) Publish RabbitMQ event "order.paid"
             try:
                 items_for_message = [
-                    {"book_id": oi.book_id, "quantity": oi.quantity}
-                    for oi in order.items
+                    {"book_id": item.book_id, "quantity": item.quantity}
+                    for item in items
                 ]
                 publish_order_event(
-                    order_id=order.id,
-                    user_id=order.user_id,
+                    order_id=order_id,
+                    user_id=user_id,
                     items=items_for_message,
                     status=OrderStatus.PAID,
                 )
@@ -1021,36 +1191,29 @@ class OrderPaymentResource(MethodView):
                 )
 
             # 5) Notify via WebSocket
-            socketio.emit(
-                "order_status_update",
-                {
-                    "order_id": order.id,
-                    "status": order.status.value,
-                    "message": "Your order has been paid for successfully.",
-                },
-                room=f"user_{user_id}",
-                namespace="/api/ws/orders",
+            emit_order_status(
+                user_id,
+                order_id,
+                OrderStatus.PAID,
+                "Your order has been paid for successfully.",
             )
             current_app.logger.info(
-                "WebSocket notification sent for order_id=%s to user_id=%s",
+                "WebSocket notification queued for order_id=%s to user_id=%s",
                 order_id,
                 user_id,
             )
 
-            # 6) Reload the order with its items to return
-            updated_order = Order.query.options(
-                db.joinedload(Order.items).joinedload(OrderItem.book)
-            ).get(order_id)
-
+            # 6) Return the paid order with its items
             current_app.logger.info(
                 "Payment confirmed for order_id=%s by user_id=%s",
                 order_id,
                 user_id,
             )
+            order_data["items"] = [_order_item_data(item) for item in items]
             return {
                 "status": "success",
                 "message": "Payment confirmed; order status set to PAID.",
-                "data": updated_order,
+                "data": order_data,
             }
 
         except SQLAlchemyError as db_err:
@@ -1106,21 +1269,39 @@ class OrderStatusUpdateResource(MethodView):
         )
 
         try:
-            # 1) Fetch the order
-            order = Order.query.get(order_id)
-            if not order:
-                current_app.logger.warning(
-                    "Order not found for status ",
-                    "update: order_id=%s",
-                    order_id,
+            new_status = OrderStatus(new_status_value)
+
+            # 1) Update in one statement; only an existing order whose
+            #    status actually changes matches
+            order = db.session.execute(
+                update(Order)
+                .where(Order.id == order_id, Order.status != new_status)
+                .values(status=new_status)
+                .returning(
+                    Order.id,
+                    Order.user_id,
+                    Order.total_amount,
+                    Order.created_at,
                 )
-                raise InvalidUsage(
-                    "Order not found.",
-                    status_code=404,
+                .execution_options(synchronize_session=False)
+            ).first()
+
+            # 2) Nothing updated: the order is missing (404) or already
+            #    has the requested status (400)
+            if order is None:
+                exists = (
+                    db.session.query(Order.id).filter_by(id=order_id).scalar()
                 )
+                if exists is None:
+                    current_app.logger.warning(
+                        "Order not found for status update: order_id=%s",
+                        order_id,
+                    )
+                    raise InvalidUsage(
+                        "Order not found.",
+                        status_code=404,
+                    )
 
-            # 2) If equal, return 400
-            if order.status.value == new_status_value:
                 current_app.logger.warning(
                     "Attempt to set order_id=%s to its current status '%s'",
                     order_id,
@@ -1131,9 +1312,13 @@ class OrderStatusUpdateResource(MethodView):
                     status_code=400,
                 )
 
-            # 3) Update and commit
-            order.status = OrderStatus(new_status_value)
+            # 3) Read the items for the response in the same transaction,
+            #    then commit
+            items = db.session.execute(
+                _ORDER_ITEM_ROWS.where(OrderItem.order_id == order_id)
+            ).all()
             db.session.commit()
+            invalidate_orders_list(order.user_id)
 
             current_app.logger.info(
                 "Order status updated successfully: order_id=%s to '%s'",
@@ -1148,14 +1333,14 @@ class OrderStatusUpdateResource(MethodView):
             ):
                 try:
                     items_for_message = [
-                        {"book_id": oi.book_id, "quantity": oi.quantity}
-                        for oi in order.items
+                        {"book_id": item.book_id, "quantity": item.quantity}
+                        for item in items
                     ]
                     publish_order_event(
                         order_id=order.id,
                         user_id=order.user_id,
                         items=items_for_message,
-                        status=order.status,
+                        status=new_status,
                     )
                     current_app.logger.info(
                         "Published 'order.status_updated' "
@@ -1170,27 +1355,30 @@ class OrderStatusUpdateResource(MethodView):
                     )
 
             # 5) Notify via WebSocket
-            socketio.emit(
-                "order_status_update",
-                {
-                    "order_id": order.id,
-                    "status": order.status.value,
-                    "message": "Order has been updated successfully.",
-                },
-                room=f"user_{order.user_id}",
-                namespace="/api/ws/orders",
+            emit_order_status(
+                order.user_id,
+                order.id,
+                new_status,
+                "Order has been updated successfully.",
             )
             current_app.logger.info(
-                "WebSocket notification sent for order_id=%s to user_id=%s",
+                "WebSocket notification queued for order_id=%s to user_id=%s",
                 order_id,
                 order.user_id,
             )
 
-            # 4) Return updated order
+            # 6) Return updated order
             return {
                 "status": "success",
                 "message": "Order status updated successfully.",
-                "data": order,
+                "data": {
+                    "id": order.id,
+                    "user_id": order.user_id,
+                    "status": new_status,
+                    "total_amount": order.total_amount,
+                    "created_at": order.created_at,
+                    "items": [_order_item_data(item) for item in items],
+                },
             }
 
         except InvalidUsage:
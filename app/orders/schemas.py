@@ -1,10 +1,21 @@
 """Schemas for the orders module."""
 
-from marshmallow import Schema, fields, validate
+from marshmallow import Schema, ValidationError, fields, validate
 
 from app.orders.enums import OrderStatus
 from app.utils.common_schema import StandardResponseSchema
 
+_ORDER_STATUS_VALUES = frozenset(e.value for e in OrderStatus)
+_ORDER_STATUS_ERROR = "Status must be one of: " + ", ".join(
+    e.value for e in OrderStatus
+)
+
+
+def _validate_order_status(value: str) -> None:
+    """Reject values that are not an OrderStatus value."""
+    if value not in _ORDER_STATUS_VALUES:
+        raise ValidationError(_ORDER_STATUS_ERROR)
+
 
 class CartItemCreateSchema(Schema):
     """Schema for creating a new cart item."""
@@ -59,20 +70,20 @@ class SimpleMessageSchema(StandardResponseSchema):
 
 
 class OrderItemReadSchema(Schema):
-    """Serialize a single OrderItem."""
+    """
+    Serialize a single OrderItem.
+
+    Views pass flat item dicts with the book's title and author already
+    selected alongside the item columns, so dumping never touches the
+    OrderItem.book relationship.
+    """
 
     id = fields.Int(dump_only=True)
     book_id = fields.Int(required=True)
     quantity = fields.Int(required=True)
     price_unit = fields.Float(required=True)
-    author = fields.String(
-        dump_only=True,
-        attribute="book.author",
-    )
-    title = fields.String(
-        dump_only=True,
-        attribute="book.title",
-    )
+    author = fields.String(dump_only=True)
+    title = fields.String(dump_only=True)
 
 
 class OrderReadSchema(Schema):
@@ -80,9 +91,7 @@ class OrderReadSchema(Schema):
 
     id = fields.Int(dump_only=True)
     user_id = fields.Int(dump_only=True)
-    status = fields.String(
-        validate=validate.OneOf([e.value for e in OrderStatus]), dump_only=True
-    )
+    status = fields.Enum(OrderStatus, by_value=True, dump_only=True)
     total_amount = fields.Float(dump_only=True)
     created_at = fields.DateTime(dump_only=True)
     items = fields.List(fields.Nested(OrderItemReadSchema), dump_only=True)
@@ -109,9 +118,10 @@ class OrderStatusUpdateSchema(Schema):
 
     status = fields.String(
         required=True,
-        validate=validate.OneOf(
-            [e.value for e in OrderStatus],
-            error="Status must be one of: "
-            + ", ".join([e.value for e in OrderStatus]),
-        ),
+        validate=_validate_order_status,
+        metadata={"enum": [e.value for e in OrderStatus]},
     )
+
+
+# Built once for views that dump their own response (to cache the body)
+orders_list_response_schema = OrdersListResponseWrapper()
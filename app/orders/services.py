@@ -1,19 +1,54 @@
 """Service for publishing order events to RabbitMQ."""
 
-import json
+import logging
+import queue
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import orjson
 import pika
-from flask import current_app
+from flask import Flask, current_app
+from pika.adapters.blocking_connection import BlockingChannel
+from pika.exceptions import AMQPError
 from app.orders.enums import OrderStatus
+from app.utils.background import STOP, BackgroundWorker
+
+# The dispatcher publishes up to this many queued events per batch,
+# waiting at most this long for a batch to fill
+BATCH_MAX_EVENTS = 100
+BATCH_WINDOW_SECONDS = 0.005
+
+# Each status maps to a fixed routing key, built once at import
+_ROUTING_KEYS = {status: f"order.{status.value}" for status in OrderStatus}
 
+# Events the inventory consumer acts on; these are always published
+# persistent so a broker restart cannot lose a stock adjustment
+_PERSISTENT_STATUSES = frozenset(
+    {OrderStatus.PAID, OrderStatus.CANCELLED, OrderStatus.REFUNDED}
+)
 
-def _get_connection():
-    """Establish a new pika.BlockingConnection."""
-    rabbit_url = current_app.config.get("RABBITMQ_URL")
-    if not rabbit_url:
-        raise RuntimeError("RABBITMQ_URL is not configured.")
 
-    params = pika.URLParameters(rabbit_url)
-    return pika.BlockingConnection(params)
+def _event_properties(persist_all: bool) -> Dict[str, pika.BasicProperties]:
+    """
+    Map each routing key to the properties its events are published with.
+
+    Notification-only events are transient (delivery_mode=1), sparing
+    the broker a disk write per message, unless `persist_all` is set.
+    """
+    persistent = pika.BasicProperties(
+        content_type="application/json", delivery_mode=2
+    )
+    transient = pika.BasicProperties(
+        content_type="application/json", delivery_mode=1
+    )
+    return {
+        routing_key: (
+            persistent
+            if persist_all or status in _PERSISTENT_STATUSES
+            else transient
+        )
+        for status, routing_key in _ROUTING_KEYS.items()
+    }
 
 
 def _declare_exchange(channel):
@@ -23,50 +58,266 @@ def _declare_exchange(channel):
     )
 
 
-def publish_order_event(
-    order_id: int, user_id: int, items: list, status: OrderStatus
-):
-    """Publish a JSON message to the 'order_events' exchange."""
-    routing_key = f"order.{status.value}"
+class RabbitPublisher:
+    """
+    Publish to RabbitMQ over one long-lived connection and channel.
+
+    The connection is opened on first publish and reused afterwards;
+    a connection or channel that has gone bad is dropped and reopened
+    once. The channel runs in transaction mode so a whole batch is
+    confirmed by the broker with a single tx.commit round trip.
+
+    pika connections are not thread-safe: a publisher must only be used
+    from one thread (the OrderEventDispatcher worker).
+    """
+
+    def __init__(
+        self,
+        params: Optional[pika.URLParameters],
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Create a publisher for the broker at `params`."""
+        self._params = params
+        self._logger = logger or logging.getLogger(__name__)
+        self._connection: Optional[pika.BlockingConnection] = None
+        self._channel: Optional[BlockingChannel] = None
+
+    def _get_channel(self) -> BlockingChannel:
+        """Return the open channel, connecting first if needed."""
+        if self._channel is not None and self._channel.is_open:
+            return self._channel
+        if self._params is None:
+            raise RuntimeError("RABBITMQ_URL is not configured.")
+
+        if self._connection is None or self._connection.is_closed:
+            self._connection = pika.BlockingConnection(self._params)
+            self._connection.add_on_connection_blocked_callback(
+                self._on_blocked
+            )
+            self._connection.add_on_connection_unblocked_callback(
+                self._on_unblocked
+            )
+            # Declared once per connection rather than on every publish;
+            # after a broker error publish_batch reconnects and re-declares
+            bootstrap = self._connection.channel()
+            _declare_exchange(bootstrap)
+            bootstrap.close()
+        self._channel = self._connection.channel()
+        self._channel.tx_select()
+        return self._channel
+
+    def _on_blocked(self, connection: Any, method: Any) -> None:
+        """Log that the broker is throttling publishers."""
+        self._logger.warning(
+            "RabbitMQ blocked the publisher connection: %s",
+            method.method.reason,
+        )
+
+    def _on_unblocked(self, connection: Any, method: Any) -> None:
+        """Log that the broker accepts publishes again."""
+        self._logger.info("RabbitMQ unblocked the publisher connection")
+
+    def process_events(self) -> None:
+        """
+        Service the idle connection (heartbeats, broker notices).
+
+        BlockingConnection only does I/O inside pika calls; without this
+        an idle connection misses heartbeats and the broker drops it.
+        """
+        if self._connection is None or not self._connection.is_open:
+            return
+        try:
+            self._connection.process_data_events(time_limit=0)
+        except AMQPError as e:
+            self._logger.warning(
+                "RabbitMQ publisher connection lost while idle: %s", str(e)
+            )
+            self._reset()
+
+    def _reset(self) -> None:
+        """Drop the current connection so the next publish reconnects."""
+        connection = self._connection
+        self._connection = None
+        self._channel = None
+        if connection is not None and connection.is_open:
+            try:
+                connection.close()
+            except AMQPError:
+                pass
+
+    def _publish_and_commit(
+        self,
+        exchange: str,
+        messages: List[Tuple[str, bytes, pika.BasicProperties]],
+    ) -> None:
+        """Publish (routing_key, body, properties) and commit as one."""
+        channel = self._get_channel()
+        for routing_key, body, properties in messages:
+            channel.basic_publish(
+                exchange=exchange,
+                routing_key=routing_key,
+                body=body,
+                properties=properties,
+            )
+        channel.tx_commit()
+
+    def publish_batch(
+        self,
+        exchange: str,
+        messages: List[Tuple[str, bytes, pika.BasicProperties]],
+    ) -> None:
+        """
+        Publish a batch of messages and wait for the broker to accept it.
 
-    connection = None
-    try:
-        connection = _get_connection()
-        channel = connection.channel()
+        On a broker error the uncommitted batch is discarded with the
+        connection and published again once on a fresh one.
+        """
+        try:
+            self._publish_and_commit(exchange, messages)
+        except AMQPError:
+            # Most likely the broker dropped the idle connection
+            self._reset()
+            self._publish_and_commit(exchange, messages)
 
-        # Ensure the exchange exists
-        _declare_exchange(channel)
+    def close(self) -> None:
+        """Close the connection, if open."""
+        self._reset()
 
-        payload = {
+
+class OrderEventDispatcher(BackgroundWorker):
+    """
+    Publish order events from a background worker thread.
+
+    Request handlers enqueue an event and return without waiting on the
+    broker. One daemon thread, started on first use, owns the
+    RabbitPublisher and publishes events in order, in batches of up to
+    BATCH_MAX_EVENTS; events still queued at interpreter exit are
+    flushed by an atexit hook.
+
+    Under run.py's eventlet monkey-patching the worker is a green thread
+    and pika's socket I/O yields to the request greenlets, so a slow
+    broker round trip delays only the worker, never a handler.
+    """
+
+    thread_name = "order-events"
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Create the dispatcher, binding it to `app` if given."""
+        super().__init__()
+        self._publisher = RabbitPublisher(None)
+        self._idle_timeout: Optional[float] = None
+        self._properties = _event_properties(persist_all=False)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Configure from `app` and register on app.extensions."""
+        params = None
+        rabbit_url = app.config.get("RABBITMQ_URL")
+        if rabbit_url:
+            params = pika.URLParameters(rabbit_url)
+            params.heartbeat = app.config["RABBITMQ_HEARTBEAT"]
+            params.blocked_connection_timeout = app.config[
+                "RABBITMQ_BLOCKED_CONNECTION_TIMEOUT"
+            ]
+        self._publisher = RabbitPublisher(params, app.logger)
+        # Service the connection at twice the heartbeat rate while idle
+        self._idle_timeout = app.config["RABBITMQ_HEARTBEAT"] / 2 or None
+        self._properties = _event_properties(
+            persist_all=app.config["RABBIT_PERSISTENT_EVENTS"]
+        )
+        self._queue = queue.Queue(maxsize=app.config["ORDER_EVENT_QUEUE_SIZE"])
+        self._logger = app.logger
+        app.extensions["order_events"] = self
+
+    def enqueue(self, routing_key: str, payload: Dict[str, Any]) -> None:
+        """Queue an event for publishing; drop it if the queue is full."""
+        if not self._offer((routing_key, payload)):
+            self._logger.error(
+                "Order event queue full; dropped '%s' for order_id=%s",
+                routing_key,
+                payload["order_id"],
+            )
+
+    def _next_batch(self) -> Tuple[List[Any], bool]:
+        """
+        Block for the next event, then collect more for a short window.
+
+        While waiting, the publisher's connection is serviced every
+        idle timeout. Return the batch and whether the stop sentinel
+        was reached.
+        """
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self._idle_timeout)]
+                break
+            except queue.Empty:
+                self._publisher.process_events()
+        deadline = time.monotonic() + BATCH_WINDOW_SECONDS
+        while len(batch) < BATCH_MAX_EVENTS and batch[-1] is not STOP:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        if batch[-1] is STOP:
+            batch.pop()
+            return batch, True
+        return batch, False
+
+    def _run(self) -> None:
+        """Worker loop: publish queued events until told to stop."""
+        while True:
+            batch, stop = self._next_batch()
+            if batch:
+                self._publish(batch)
+            if stop:
+                break
+        self._publisher.close()
+
+    def _publish(self, batch: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Serialize and publish a batch of events, logging any failure."""
+        order_ids = [payload["order_id"] for _, payload in batch]
+        try:
+            self._publisher.publish_batch(
+                exchange="order_events",
+                messages=[
+                    (
+                        routing_key,
+                        orjson.dumps(payload),
+                        self._properties[routing_key],
+                    )
+                    for routing_key, payload in batch
+                ],
+            )
+            self._logger.info(
+                "Published %d RabbitMQ event(s) to 'order_events' "
+                "for order_ids=%s",
+                len(batch),
+                order_ids,
+            )
+        except Exception as e:
+            # Log any publishing errors for later troubleshooting
+            self._logger.error(
+                "Failed to publish order events (order_ids=%s): %s",
+                order_ids,
+                str(e),
+            )
+
+
+def publish_order_event(
+    order_id: int, user_id: int, items: list, status: OrderStatus
+):
+    """Queue a JSON message for the 'order_events' exchange."""
+    current_app.extensions["order_events"].enqueue(
+        _ROUTING_KEYS[status],
+        {
             "order_id": order_id,
             "user_id": user_id,
             "items": items,
             "status": status.value,
-        }
-        body = json.dumps(payload)
-
-        channel.basic_publish(
-            exchange="order_events",
-            routing_key=routing_key,
-            body=body,
-            properties=pika.BasicProperties(
-                content_type="application/json", delivery_mode=2
-            ),
-        )
-        current_app.logger.info(
-            "Published RabbitMQ event to 'order_events' "
-            "with routing_key='%s' for order_id=%s",
-            routing_key,
-            order_id,
-        )
-    except Exception as e:
-        # Log any publishing errors for later troubleshooting
-        current_app.logger.error(
-            "Failed to publish order event (order_id=%s, status=%s): %s",
-            order_id,
-            status.value,
-            str(e),
-        )
-    finally:
-        if connection is not None and not connection.is_closed:
-            connection.close()
+        },
+    )
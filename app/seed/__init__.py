@@ -0,0 +1 @@
+"""Seed bookkeeping package for the bookstore."""
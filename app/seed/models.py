@@ -0,0 +1,21 @@
+"""Define the SQLAlchemy model recording which seed data is applied."""
+
+from sqlalchemy import Column, DateTime, Integer, func
+
+from app.extensions import db
+
+
+class SeedMeta(db.Model):
+    """Single row holding the version of the applied default seed data."""
+
+    __tablename__ = "seed_meta"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False)
+    applied_at = Column(
+        DateTime(timezone=True), server_default=func.now(), onupdate=func.now()
+    )
+
+    def __repr__(self) -> str:
+        """Return a string representation of the SeedMeta object."""
+        return f"<SeedMeta version={self.version!r}>"
@@ -0,0 +1,67 @@
+"""Run queued work on a background worker thread."""
+
+import atexit
+import logging
+import queue
+import threading
+from typing import Any, Optional
+
+# Queue sentinel telling a worker to exit
+STOP = object()
+
+
+class BackgroundWorker:
+    """
+    Hand items from request handlers to one daemon worker thread.
+
+    The thread is started on first use and drains the queue in _run(),
+    which subclasses implement and which must return once it takes
+    STOP off the queue; items still queued at interpreter exit are
+    handled before it does, via an atexit hook.
+    """
+
+    thread_name = "background-worker"
+
+    def __init__(self):
+        """Create the worker with an unbounded queue; nothing runs yet."""
+        self._queue: "queue.Queue[Any]" = queue.Queue()
+        self._logger = logging.getLogger(type(self).__module__)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        """Start the worker thread if it is not running yet."""
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                thread = threading.Thread(
+                    target=self._run, name=self.thread_name, daemon=True
+                )
+                thread.start()
+                atexit.register(self.shutdown)
+                self._thread = thread
+
+    def _offer(self, item: Any) -> bool:
+        """Queue `item` for the worker; return False if the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def _run(self) -> None:
+        """Worker loop: handle queued items until STOP is taken."""
+        raise NotImplementedError
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Handle what is still queued, then stop the worker."""
+        thread = self._thread
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(STOP, timeout=timeout)
+        except queue.Full:
+            return
+        thread.join(timeout)
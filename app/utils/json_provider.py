@@ -0,0 +1,43 @@
+"""Flask JSON provider that serializes with orjson."""
+
+from typing import Any, Union
+
+import orjson
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    Serialize Flask (and flask-smorest) responses with orjson.
+
+    Types orjson cannot encode natively (e.g. Decimal) fall back to
+    Flask's default encoder.
+    """
+
+    def _encode(self, obj: Any, indent: bool = False) -> bytes:
+        """Encode `obj` to JSON bytes."""
+        option = orjson.OPT_NAIVE_UTC | orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string."""
+        return self._encode(obj, indent=bool(kwargs.get("indent"))).decode()
+
+    def loads(self, s: Union[str, bytes], **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Return a JSON response without a str round trip."""
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (
+            self.compact is None and self._app.debug
+        ) or self.compact is False
+        return self._app.response_class(
+            self._encode(obj, indent=indent) + b"\n", mimetype=self.mimetype
+        )
@@ -0,0 +1,30 @@
+"""Serve the generated OpenAPI document from a cached JSON body."""
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+from flask import Response, current_app
+
+if TYPE_CHECKING:
+    from flask_smorest import Api
+
+
+def cached_spec_view(api: "Api") -> Callable[[], Response]:
+    """
+    Return a view that serves `api`'s OpenAPI spec as JSON.
+
+    The spec is complete once create_app has registered every blueprint,
+    so it is serialized on the first request and the bytes are reused
+    afterwards instead of rebuilding and re-encoding it on every hit.
+    """
+    body: Optional[bytes] = None
+
+    def openapi_json() -> Response:
+        """Return the serialized OpenAPI spec."""
+        nonlocal body
+        if body is None:
+            body = current_app.json.dumps(
+                api.spec.to_dict(), indent=2
+            ).encode()
+        return Response(body, mimetype="application/json")
+
+    return openapi_json
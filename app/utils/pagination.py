@@ -0,0 +1,54 @@
+"""Pagination that counts matching rows in the same query as the page."""
+
+from math import ceil
+from typing import Any, List, NamedTuple
+
+from sqlalchemy import Select, func, select
+
+from app.extensions import db
+
+
+class Page(NamedTuple):
+    """One page of results plus the totals the paginated schemas read."""
+
+    items: List[Any]
+    page: int
+    pages: int
+    total: int
+    per_page: int
+
+
+def paginate_with_count(stmt: Select, page: int, per_page: int) -> Page:
+    """
+    Return one page of the entities selected by `stmt`.
+
+    The total is read from a COUNT(*) OVER () column on the page rows,
+    so no separate COUNT query is issued. Only a page past the end
+    (which returns no rows) falls back to counting. Out-of-range
+    arguments are handled like db.paginate(error_out=False).
+    """
+    page = page if page >= 1 else 1
+    per_page = per_page if per_page >= 1 else 20
+
+    rows = db.session.execute(
+        stmt.add_columns(func.count().over().label("total_count"))
+        .limit(per_page)
+        .offset((page - 1) * per_page)
+    ).all()
+
+    if rows:
+        total = rows[0].total_count
+    elif page == 1:
+        total = 0
+    else:
+        total = db.session.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        ).scalar_one()
+
+    return Page(
+        items=[row[0] for row in rows],
+        page=page,
+        pages=ceil(total / per_page),
+        total=total,
+        per_page=per_page,
+    )
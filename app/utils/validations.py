@@ -1,10 +1,45 @@
 """Utility functions for input validation such as strong password checks."""
 
 import re
+import string
 
 from typing import Any, Union
 from marshmallow import ValidationError
 
+_SPECIAL_CHARACTERS = '!@#$%^&*(),.?":{}|<>'
+
+# Character classes a strong password must contain, compiled once
+_RE_UPPER = re.compile(r"[A-Z]")
+_RE_LOWER = re.compile(r"[a-z]")
+_RE_DIGIT = re.compile(r"\d")
+_RE_SPECIAL = re.compile(f"[{re.escape(_SPECIAL_CHARACTERS)}]")
+
+
+def _build_class_table() -> bytes:
+    """
+    Build a bytes.translate() table mapping each byte to its class.
+
+    Uppercase letters map to 1, lowercase to 2, digits to 3, special
+    characters to 4 and anything else to 0.
+    """
+    table = bytearray(256)
+    for char_class, characters in enumerate(
+        (
+            string.ascii_uppercase,
+            string.ascii_lowercase,
+            string.digits,
+            _SPECIAL_CHARACTERS,
+        ),
+        start=1,
+    ):
+        for character in characters:
+            table[ord(character)] = char_class
+    return bytes(table)
+
+
+# Classifies an ASCII password in a single C-level translate() pass
+_CLASS_TABLE = _build_class_table()
+
 
 def validate_strong_password(password: str) -> None:
     """
@@ -25,17 +60,50 @@ def validate_strong_password(password: str) -> None:
         raise ValueError("Password cannot be empty.")
     if len(password) < 8:
         raise ValidationError("Password must be at least 8 characters long.")
-    if not re.search(r"[A-Z]", password):
+    if password.isascii():
+        # Single-class passwords fail on C-level str predicates, before
+        # the class scan, with the message the scans would produce
+        if password.isdigit() or password.islower():
+            raise ValidationError(
+                "Password must contain at least one uppercase letter."
+            )
+        if password.isupper():
+            raise ValidationError(
+                "Password must contain at least one lowercase letter."
+            )
+        if password.isalpha():
+            raise ValidationError("Password must contain at least one digit.")
+
+        classes = password.encode("ascii").translate(_CLASS_TABLE)
+        if b"\x01" not in classes:
+            raise ValidationError(
+                "Password must contain at least one uppercase letter."
+            )
+        if b"\x02" not in classes:
+            raise ValidationError(
+                "Password must contain at least one lowercase letter."
+            )
+        if b"\x03" not in classes:
+            raise ValidationError("Password must contain at least one digit.")
+        if b"\x04" not in classes:
+            raise ValidationError(
+                "Password must contain at least one special character."
+            )
+        return
+
+    # Non-ASCII passwords keep the pattern scans (\d also matches
+    # non-ASCII digits)
+    if not _RE_UPPER.search(password):
         raise ValidationError(
             "Password must contain at least one uppercase letter."
         )
-    if not re.search(r"[a-z]", password):
+    if not _RE_LOWER.search(password):
         raise ValidationError(
             "Password must contain at least one lowercase letter."
         )
-    if not re.search(r"\d", password):
+    if not _RE_DIGIT.search(password):
         raise ValidationError("Password must contain at least one digit.")
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+    if not _RE_SPECIAL.search(password):
         raise ValidationError(
             "Password must contain at least one special character."
         )
@@ -48,7 +116,8 @@ def validate_rating(n: Union[int, Any]) -> None:
     Raises:
         ValidationError: If `n` is not an integer or not in the range 1 to 5.
     """
-    if not isinstance(n, int):
+    # An exact type check: unlike isinstance, it also rejects bool
+    if type(n) is not int:
         raise ValidationError("Rating must be an integer.")
 
     if not (1 <= n <= 5):
@@ -0,0 +1,112 @@
+"""Coalesce order status WebSocket emits off the request path."""
+
+import queue
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from flask import Flask, current_app
+
+from app.extensions import socketio
+from app.orders.enums import OrderStatus
+from app.utils.background import STOP, BackgroundWorker
+from app.websocket.events import OrderNamespace
+
+# The emitter collects updates for at most this long (or this many)
+# before emitting, so an update is delayed by no more than the window
+EMIT_MAX_EVENTS = 100
+EMIT_WINDOW_SECONDS = 0.01
+
+
+class OrderStatusEmitter(BackgroundWorker):
+    """
+    Emit 'order_status_update' events from a background worker thread.
+
+    Request handlers enqueue an update and return without waiting on
+    the Socket.IO message queue. The worker collects updates for up to
+    EMIT_WINDOW_SECONDS and emits only the latest one per room and
+    order, so a burst of status changes for one order costs one emit.
+    """
+
+    thread_name = "order-status-emits"
+
+    def __init__(self, app: Optional[Flask] = None):
+        """Create the emitter, binding it to `app` if given."""
+        super().__init__()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app: Flask) -> None:
+        """Configure from `app` and register on app.extensions."""
+        self._queue = queue.Queue(maxsize=app.config["ORDER_EVENT_QUEUE_SIZE"])
+        self._logger = app.logger
+        app.extensions["order_status_emits"] = self
+
+    def enqueue(self, room: str, payload: Dict[str, Any]) -> None:
+        """Queue an update for `room`; drop it if the queue is full."""
+        if not self._offer((room, payload)):
+            self._logger.error(
+                "Order status emit queue full; dropped update for "
+                "order_id=%s",
+                payload["order_id"],
+            )
+
+    def _next_batch(
+        self,
+    ) -> Tuple[Dict[Tuple[str, Any], Dict[str, Any]], bool]:
+        """
+        Block for the next update, then coalesce more for a short window.
+
+        Return the latest payload per (room, order_id), in first-seen
+        order, and whether the stop sentinel was reached.
+        """
+        pending: Dict[Tuple[str, Any], Dict[str, Any]] = {}
+        item = self._queue.get()
+        deadline = time.monotonic() + EMIT_WINDOW_SECONDS
+        received = 0
+        while item is not STOP:
+            room, payload = item
+            pending[(room, payload["order_id"])] = payload
+            received += 1
+            remaining = deadline - time.monotonic()
+            if received >= EMIT_MAX_EVENTS or remaining <= 0:
+                return pending, False
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                return pending, False
+        return pending, True
+
+    def _run(self) -> None:
+        """Worker loop: emit queued updates until told to stop."""
+        while True:
+            pending, stop = self._next_batch()
+            for (room, _), payload in pending.items():
+                self._emit(room, payload)
+            if stop:
+                break
+
+    def _emit(self, room: str, payload: Dict[str, Any]) -> None:
+        """Emit one update to `room`, logging any failure."""
+        try:
+            socketio.emit(
+                "order_status_update",
+                payload,
+                room=room,
+                namespace=OrderNamespace.namespace,
+            )
+        except Exception as e:
+            self._logger.error(
+                "WebSocket emit failed for order_id=%s: %s",
+                payload["order_id"],
+                str(e),
+            )
+
+
+def emit_order_status(
+    user_id: int, order_id: int, status: OrderStatus, message: str
+) -> None:
+    """Queue an 'order_status_update' for the user's room."""
+    current_app.extensions["order_status_emits"].enqueue(
+        f"user_{user_id}",
+        {"order_id": order_id, "status": status.value, "message": message},
+    )
@@ -0,0 +1,31 @@
+"""Add partial index on orders pending inventory processing
+
+Revision ID: a3c91e7f5b20
+Revises: 46fdf236d2ba
+Create Date: 2026-10-16 02:25:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "a3c91e7f5b20"
+down_revision = "46fdf236d2ba"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("orders", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_orders_pending_inv",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("NOT inventory_processed"),
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("orders", schema=None) as batch_op:
+        batch_op.drop_index("ix_orders_pending_inv")
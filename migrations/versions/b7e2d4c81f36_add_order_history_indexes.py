@@ -0,0 +1,40 @@
+"""Add indexes for order history and order item lookups
+
+Revision ID: b7e2d4c81f36
+Revises: a3c91e7f5b20
+Create Date: 2026-10-16 02:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b7e2d4c81f36"
+down_revision = "a3c91e7f5b20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("orders", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_orders_user_created",
+            ["user_id", sa.text("created_at DESC")],
+            unique=False,
+        )
+
+    with op.batch_alter_table("order_items", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_order_items_order_book",
+            ["order_id", "book_id"],
+            unique=False,
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("order_items", schema=None) as batch_op:
+        batch_op.drop_index("ix_order_items_order_book")
+
+    with op.batch_alter_table("orders", schema=None) as batch_op:
+        batch_op.drop_index("ix_orders_user_created")
@@ -0,0 +1,35 @@
+"""Add seed_meta table recording the applied seed data version
+
+Revision ID: c4f1a9e27d53
+Revises: b7e2d4c81f36
+Create Date: 2026-10-16 03:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "c4f1a9e27d53"
+down_revision = "b7e2d4c81f36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "seed_meta",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Integer(), nullable=False),
+        sa.Column(
+            "applied_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade():
+    op.drop_table("seed_meta")
@@ -1,6 +1,20 @@
 """This script is used to run the Flask application with SocketIO support."""
 
-from app import create_app, socketio
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Patch before anything else imports socket/threading; only the web
+# server needs eventlet, so this is kept out of the app package
+if os.getenv("FLASK_ENV", "production") == "production":
+    import eventlet
+
+    eventlet.monkey_patch()
+
+from app import create_app  # noqa: E402
+from app.extensions import socketio  # noqa: E402
 
 
 app = create_app()
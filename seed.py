@@ -1,52 +1,56 @@
 """Seed script for the Demo bookstore application."""
+import io
+import logging
 import os
 import random
-import string
 import sys
 
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date
+from types import MappingProxyType
 
-from app import create_app, db
-from app.models import User, Book, Category
-
-
-def generate_unique_isbn(session):
-    """
-    Generate a random 13-digit ISBN (numeric), and make sure
-    it doesn’t already exist in the books table. Retry until unique.
-    """
-    while True:
-        # Generate a 13-digit random numeric string
-        isbn_candidate = "".join(random.choices(string.digits, k=13))
-        exists = session.query(Book).filter_by(isbn=isbn_candidate).first()
-        if not exists:
-            return isbn_candidate
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from werkzeug.security import generate_password_hash
 
+from app import create_app, db
+from app.models import User, Book, Category, SeedMeta
+from app.utils.validations import validate_strong_password
 
-def seed_admin():
-    """Create a default admin user if none exists."""
+logger = logging.getLogger("seed")
 
-    admin_email = os.getenv("ADMIN_EMAIL", "admin@example.com")
-    admin_password = os.getenv("ADMIN_PASSWORD", "ChangeMe123!")
 
-    existing = User.query.filter_by(email=admin_email).first()
-    if existing:
-        print(
-            f"[seed_all] Admin user {admin_email} already exists → skipping."
-        )
-        return
+def _freeze_books(data):
+    """
+    Return `data` read-only, down to each book entry.
 
-    admin = User(email=admin_email, is_admin=True)
-    admin.set_password(admin_password)
-    db.session.add(admin)
-    print(f"[seed_all] Created admin user: {admin_email}")
+    Titles must be unique, ignoring case and whitespace; a repeat is a
+    mistake in DEFAULT_DATA and fails the import.
+    """
+    seen_titles = set()
+    frozen = {}
+    for cat_name, books in data.items():
+        for book in books:
+            key = " ".join(book["title"].casefold().split())
+            assert (
+                key not in seen_titles
+            ), f"Duplicate seed book {book['title']!r} in {cat_name!r}."
+            seen_titles.add(key)
+        frozen[cat_name] = tuple(MappingProxyType(book) for book in books)
+    return MappingProxyType(frozen)
 
 
-def seed_categories_and_books():
-    """Create default categories and books if they don’t exist."""
+# Version of the seed data below, recorded in seed_meta once applied;
+# bump it whenever DEFAULT_DATA or the seeded admin changes, or an
+# already seeded database skips the new data
+SEED_VERSION = 1
 
-    default_data = {
-        "Fiction": [
+# Default categories and their books, built (and checked for repeated titles)
+# once at import and shared read-only between seed runs
+DEFAULT_DATA = _freeze_books(
+    {
+        "Fiction": (
             {
                 "title": "The Great Gatsby",
                 "author": "F. Scott Fitzgerald",
@@ -97,17 +101,17 @@ def seed_categories_and_books():
                 "stock": 8,
                 "publication_date": date(2015, 11, 10),
             },
-        ],
-        "Non-Fiction": [
+        ),
+        "Non-Fiction": (
             {
                 "title": "Sapiens",
                 "author": "Yuval Noah Harari",
                 "description": "A brief history of humankind...",
                 "price": 12.99,
                 "stock": 7,
-            }
-        ],
-        "Business": [
+            },
+        ),
+        "Business": (
             {
                 "title": "Rich Dad Poor Dad",
                 "author": "Robert T. Kiyosaki",
@@ -140,8 +144,8 @@ def seed_categories_and_books():
                 "stock": 15,
                 "publication_date": date(2017, 9, 19),
             },
-        ],
-        "Satire": [
+        ),
+        "Satire": (
             {
                 "title": "I Do Not Come to You by Chance",
                 "author": "Adaobi Tricia Nwaubani",
@@ -151,8 +155,8 @@ def seed_categories_and_books():
                 "stock": 11,
                 "publication_date": date(2009, 5, 18),
             },
-        ],
-        "Fantasy": [
+        ),
+        "Fantasy": (
             {
                 "title": "Freshwater",
                 "author": "Akwaeke Emezi",
@@ -189,17 +193,8 @@ def seed_categories_and_books():
                 "stock": 14,
                 "publication_date": date(2006, 7, 25),
             },
-        ],
-        "History": [
-            {
-                "title": "Sapiens: A Brief History of Humankind",
-                "author": "Yuval Noah Harari",
-                "isbn": "9780062316097",
-                "description": "Explores the history of Homo sapiens from the Stone Age to the 21st century.",
-                "price": 18.75,
-                "stock": 18,
-                "publication_date": date(2014, 2, 10),
-            },
+        ),
+        "History": (
             {
                 "title": "The Gulag Archipelago",
                 "author": "Aleksandr Solzhenitsyn",
@@ -209,8 +204,8 @@ def seed_categories_and_books():
                 "stock": 7,
                 "publication_date": date(1973, 1, 1),
             },
-        ],
-        "Thriller": [
+        ),
+        "Thriller": (
             {
                 "title": "My Sister, the Serial Killer",
                 "author": "Oyinkan Braithwaite",
@@ -247,8 +242,8 @@ def seed_categories_and_books():
                 "stock": 19,
                 "publication_date": date(2005, 8, 1),
             },
-        ],
-        "Science Fiction": [
+        ),
+        "Science Fiction": (
             {
                 "title": "Dune",
                 "author": "Frank Herbert",
@@ -285,8 +280,8 @@ def seed_categories_and_books():
                 "stock": 18,
                 "publication_date": date(2014, 2, 11),
             },
-        ],
-        "Romance": [
+        ),
+        "Romance": (
             {
                 "title": "Pride and Prejudice",
                 "author": "Jane Austen",
@@ -301,8 +296,8 @@ def seed_categories_and_books():
                 "price": 11.99,
                 "stock": 8,
             },
-        ],
-        "Poetry": [
+        ),
+        "Poetry": (
             {
                 "title": "The Sun and Her Flowers",
                 "author": "Rupi Kaur",
@@ -317,8 +312,8 @@ def seed_categories_and_books():
                 "price": 10.00,
                 "stock": 15,
             },
-        ],
-        "Self-Help": [
+        ),
+        "Self-Help": (
             {
                 "title": "Atomic Habits",
                 "author": "James Clear",
@@ -352,8 +347,8 @@ def seed_categories_and_books():
                 "stock": 23,
                 "publication_date": date(2012, 2, 28),
             },
-        ],
-        "Biography": [
+        ),
+        "Biography": (
             {
                 "title": "Steve Jobs",
                 "author": "Walter Isaacson",
@@ -399,8 +394,8 @@ def seed_categories_and_books():
                 "stock": 9,
                 "publication_date": date(2015, 6, 1),
             },
-        ],
-        "Children's": [
+        ),
+        "Children's": (
             {
                 "title": "Where the Wild Things Are",
                 "author": "Maurice Sendak",
@@ -415,8 +410,8 @@ def seed_categories_and_books():
                 "price": 9.99,
                 "stock": 20,
             },
-        ],
-        "Literary Fiction": [
+        ),
+        "Literary Fiction": (
             {
                 "title": "Stay With Me",
                 "author": "Ayọ̀bámi Adébáyọ̀",
@@ -426,8 +421,8 @@ def seed_categories_and_books():
                 "stock": 10,
                 "publication_date": date(2017, 3, 2),
             },
-        ],
-        "Historical Fiction": [
+        ),
+        "Historical Fiction": (
             {
                 "title": "Half of a Yellow Sun",
                 "author": "Chimamanda Ngozi Adichie",
@@ -437,8 +432,8 @@ def seed_categories_and_books():
                 "stock": 15,
                 "publication_date": date(2006, 9, 4),
             },
-        ],
-        "Programming": [
+        ),
+        "Programming": (
             {
                 "title": "Clean Code",
                 "author": "Robert C. Martin",
@@ -475,39 +470,235 @@ def seed_categories_and_books():
                 "stock": 10,
                 "publication_date": date(2015, 7, 1),
             },
-        ],
+        ),
     }
+)
 
-    # Ensure the default categories and books are created
-    for cat_name, books in default_data.items():
-        category = Category.query.filter_by(name=cat_name).first()
-        if not category:
-            category = Category(name=cat_name)
-            db.session.add(category)
-            db.session.flush()
-            print(f"[seed_all] Created category: {cat_name}")
-        else:
-            print(f"[seed_all] Category {cat_name} already exists → skipping.")
 
+def generate_unique_isbns(count, taken):
+    """
+    Generate `count` distinct random 13-digit ISBNs (numeric), none of
+    which is in `taken`. Collisions are removed with set arithmetic and
+    redrawn until enough remain.
+    """
+    isbns = set()
+    while len(isbns) < count:
+        # Draw the missing ones as zero-padded 13-digit numbers, one RNG
+        # call each
+        isbns.update(
+            f"{random.randrange(10**13):013d}"
+            for _ in range(count - len(isbns))
+        )
+        isbns -= taken
+    return list(isbns)
+
+
+# Book rows are sent to the database in batches of at most this many,
+# bounding the parameter and COPY buffers held in memory at once
+SEED_BATCH_SIZE = int(os.getenv("SEED_BATCH_SIZE", "10000"))
+if SEED_BATCH_SIZE < 1:
+    raise ValueError(
+        f"SEED_BATCH_SIZE must be at least 1, got {SEED_BATCH_SIZE}."
+    )
+
+# Built once and reused for every batch and run; for books, RETURNING
+# gives each new id in the order of the rows
+_BOOK_INSERT = insert(Book).returning(Book.id, sort_by_parameter_order=True)
+_USER_INSERT = insert(User)
+
+# Loads at least this large are streamed into PostgreSQL with COPY;
+# smaller ones use INSERT ... RETURNING, which also reports the new ids
+COPY_MIN_ROWS = 1000
+
+# Book columns written by the seed, in COPY column order
+BOOK_COPY_COLUMNS = (
+    "title",
+    "author",
+    "description",
+    "isbn",
+    "price",
+    "stock",
+    "publication_date",
+    "category_id",
+    "summary",
+    "is_active",
+)
+
+
+def _batches(rows, size=SEED_BATCH_SIZE):
+    """Yield consecutive slices of `rows` holding at most `size` rows."""
+    for start in range(0, len(rows), size):
+        end = start + size
+        yield rows[start:end]
+
+
+def _copy_csv_field(value):
+    """
+    Format `value` as a COPY CSV field: None as an unquoted empty field
+    (NULL), anything else quoted, so no text, even empty, reads as NULL.
+    """
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def bulk_copy_books(session, rows, columns=BOOK_COPY_COLUMNS):
+    """
+    Stream book rows into the books table with PostgreSQL COPY.
+
+    The rows are written as CSV to an in-memory buffer; None is sent
+    as an unquoted empty field, which COPY loads as NULL, and every
+    other value is quoted so it loads exactly as the INSERT path would.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(
+            ",".join(_copy_csv_field(row[column]) for column in columns)
+        )
+        buffer.write("\n")
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {Book.__tablename__} ({', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_ignoring_conflicts(model):
+    """
+    Return an INSERT for `model` that supports ON CONFLICT clauses.
+
+    PostgreSQL in production; SQLite (local runs) has the same clause.
+    """
+    if db.engine.dialect.name == "postgresql":
+        return pg_insert(model)
+    return sqlite_insert(model)
+
+
+# Dev-only: with SEED_FAST_HASH set, seeded passwords are hashed with
+# a low-cost PBKDF2 instead of Werkzeug's default (memory-hard scrypt).
+# Never use it for a real deployment; rotate such accounts' passwords
+FAST_HASH_METHOD = "pbkdf2:sha256:1000"
+
+
+def _hash_password_fast(password):
+    """Validate a password and hash it with the cheap FAST_HASH_METHOD."""
+    validate_strong_password(password)
+    return generate_password_hash(password, method=FAST_HASH_METHOD)
+
+
+def hash_passwords(passwords):
+    """
+    Validate and hash `passwords`, in order.
+
+    The key derivation is CPU-bound, so several passwords are hashed in
+    parallel across processes; a single one is hashed in-process.
+    """
+    fast = os.getenv("SEED_FAST_HASH", "False").lower() in ["true", "1"]
+    hasher = _hash_password_fast if fast else User.hash_password
+    if len(passwords) <= 1:
+        return [hasher(password) for password in passwords]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(hasher, passwords))
+
+
+def seed_admin():
+    """
+    Return the row for a default admin user if none exists, else None.
+
+    The row is inserted by main() in the same transaction as the rest
+    of the seed, without going through the ORM unit of work.
+    """
+
+    admin_email = os.getenv("ADMIN_EMAIL", "admin@example.com")
+    admin_password = os.getenv("ADMIN_PASSWORD", "ChangeMe123!")
+
+    # Only the id is needed to know the admin exists; email is unique
+    # and indexed, so this is an index lookup with no User hydration
+    existing_id = db.session.scalar(
+        select(User.id).where(User.email == admin_email)
+    )
+    if existing_id is not None:
+        logger.info("Admin user %s already exists → skipping.", admin_email)
+        return None
+
+    (password_hash,) = hash_passwords([admin_password])
+    return {
+        "email": admin_email,
+        "password_hash": password_hash,
+        "is_admin": True,
+    }
+
+
+def seed_categories_and_books():
+    """
+    Create default categories and books if they don’t exist.
+
+    Return the number of books and of categories created.
+    """
+
+    # Create the missing categories in one statement (RETURNING only
+    # the ones actually inserted), then map every category name to its id
+    created_categories = set(
+        db.session.scalars(
+            _insert_ignoring_conflicts(Category)
+            .values([{"name": cat_name} for cat_name in DEFAULT_DATA])
+            .on_conflict_do_nothing(index_elements=["name"])
+            .returning(Category.name)
+        )
+    )
+    category_ids = dict(
+        db.session.execute(
+            select(Category.name, Category.id).where(
+                Category.name.in_(DEFAULT_DATA)
+            )
+        ).all()
+    )
+    if logger.isEnabledFor(logging.DEBUG):
+        for cat_name in DEFAULT_DATA:
+            if cat_name in created_categories:
+                logger.debug("Created category: %s", cat_name)
+            else:
+                logger.debug(
+                    "Category %s already exists → skipping.", cat_name
+                )
+
+    # Load existing titles and ISBNs once and check against them in
+    # memory; the sets also take the titles and ISBNs picked for this
+    # batch, so duplicates within DEFAULT_DATA are caught too
+    existing_titles = set(db.session.scalars(select(Book.title)))
+    existing_isbns = set(db.session.scalars(select(Book.isbn)))
+
+    # Books are collected as plain rows and inserted in one executemany;
+    # rows needing a generated ISBN get one in a single batch at the end
+    book_rows = []
+    book_categories = []
+    rows_without_isbn = []
+
+    # Ensure the default categories and books are created
+    for cat_name, books in DEFAULT_DATA.items():
         for book_info in books:
             title = book_info["title"]
-            existing_book = Book.query.filter_by(title=title).first()
-            if existing_book:
-                print(f"[seed_all] Book '{title}' already exists → skipping.")
+            if title in existing_titles:
+                logger.debug("Book '%s' already exists → skipping.", title)
                 continue
 
             # Provide default ISBN and publication_date if missing
-            if book_info.get("isbn"):
-                isbn_val = book_info["isbn"]
-                # If someone manually provided an ISBN, we should still check uniqueness
-                if Book.query.filter_by(isbn=isbn_val).first():
-                    print(
-                        f"[seed_all] Provided ISBN {isbn_val} for '{title}' already exists! "
-                        "Generating a new random one."
-                    )
-                    isbn_val = generate_unique_isbn(db.session)
-            else:
-                isbn_val = generate_unique_isbn(db.session)
+            isbn_val = book_info.get("isbn")
+            # If someone manually provided an ISBN, we should still check uniqueness
+            if isbn_val and isbn_val in existing_isbns:
+                logger.warning(
+                    "Provided ISBN %s for '%s' already exists! "
+                    "Generating a new random one.",
+                    isbn_val,
+                    title,
+                )
+                isbn_val = None
 
             # Determine publication_date: use provided or default to Jan 1, 2000
             pub_date = book_info.get("publication_date")
@@ -517,40 +708,119 @@ def seed_categories_and_books():
             # Determine summary: use provided or None
             summary = book_info.get("summary")
 
-            new_book = Book(
-                title=title,
-                author=book_info["author"],
-                description=book_info.get("description", ""),
-                isbn=isbn_val,
-                price=book_info["price"],
-                stock=book_info["stock"],
-                publication_date=pub_date,
-                category_id=category.id,
-                summary=summary,
-                is_active=True,
+            book_rows.append(
+                {
+                    "title": title,
+                    "author": book_info["author"],
+                    "description": book_info.get("description", ""),
+                    "isbn": isbn_val,
+                    "price": book_info["price"],
+                    "stock": book_info["stock"],
+                    "publication_date": pub_date,
+                    "category_id": category_ids[cat_name],
+                    "summary": summary,
+                    "is_active": True,
+                }
             )
-            db.session.add(new_book)
-            print(
-                f"[seed_all] Created book: '{title}' in category '{cat_name}'"
+            existing_titles.add(title)
+            if isbn_val:
+                existing_isbns.add(isbn_val)
+            else:
+                rows_without_isbn.append(book_rows[-1])
+            book_categories.append(cat_name)
+
+    new_isbns = generate_unique_isbns(len(rows_without_isbn), existing_isbns)
+    for row, isbn_val in zip(rows_without_isbn, new_isbns):
+        row["isbn"] = isbn_val
+
+    if not book_rows:
+        return 0, len(created_categories)
+
+    if (
+        db.engine.dialect.name == "postgresql"
+        and len(book_rows) >= COPY_MIN_ROWS
+    ):
+        for batch in _batches(book_rows):
+            bulk_copy_books(db.session, batch)
+        if logger.isEnabledFor(logging.DEBUG):
+            for row, cat_name in zip(book_rows, book_categories):
+                logger.debug(
+                    "Created book: '%s' in category '%s'",
+                    row["title"],
+                    cat_name,
+                )
+        return len(book_rows), len(created_categories)
+
+    # One INSERT ... RETURNING per batch of rows
+    new_ids = []
+    for batch in _batches(book_rows):
+        new_ids.extend(db.session.scalars(_BOOK_INSERT, batch))
+    if logger.isEnabledFor(logging.DEBUG):
+        for row, cat_name, book_id in zip(book_rows, book_categories, new_ids):
+            logger.debug(
+                "Created book: '%s' (id=%s) in category '%s'",
+                row["title"],
+                book_id,
+                cat_name,
             )
+    return len(book_rows), len(created_categories)
+
+
+def record_seed_version():
+    """Record SEED_VERSION as the applied seed data version."""
+    db.session.execute(
+        _insert_ignoring_conflicts(SeedMeta)
+        .values(id=1, version=SEED_VERSION)
+        .on_conflict_do_update(
+            index_elements=["id"], set_={"version": SEED_VERSION}
+        )
+    )
 
 
 def main():
     """
     Entrypoint: runs both seed_admin and seed_categories_and_books.
     """
+    # Only the seed's own logger is configured; per-row messages are
+    # DEBUG, so a normal run writes just a few lines
+    if not logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("[seed_all] %(message)s"))
+        logger.addHandler(handler)
+    logger.setLevel(os.getenv("SEED_LOG_LEVEL", "INFO").upper())
+    logger.info("Seeding started.")
+
     app = create_app()
     with app.app_context():
+        # Seed in one transaction: nothing is flushed implicitly before a
+        # query, and the final commit does not expire the seeded objects
+        db.session().expire_on_commit = False
         try:
-            seed_admin()
-            seed_categories_and_books()
+            # A database already seeded with this version needs no work
+            applied = db.session.scalar(select(SeedMeta.version).limit(1))
+            if applied == SEED_VERSION:
+                logger.info(
+                    "Seed version %d already applied → skipping.",
+                    SEED_VERSION,
+                )
+                return
+
+            with db.session.no_autoflush:
+                admin_row = seed_admin()
+                if admin_row is not None:
+                    db.session.execute(_USER_INSERT, [admin_row])
+                    logger.info("Created admin user: %s", admin_row["email"])
+                n_books, n_categories = seed_categories_and_books()
+                record_seed_version()
             db.session.commit()
-            print("[seed_all] Seeding complete.")
+            logger.info(
+                "Seeding complete: created %d books and %d categories.",
+                n_books,
+                n_categories,
+            )
         except Exception as e:
             db.session.rollback()
-            print(
-                f"[seed_all] ERROR during seeding: {str(e)}", file=sys.stderr
-            )
+            logger.error("ERROR during seeding: %s", str(e))
             sys.exit(1)
 
 
@@ -0,0 +1,67 @@
+"""Shared fixtures for the API tests."""
+
+import os
+import tempfile
+
+# Configure the app before it is imported; point DATABASE_URL_TEST at a
+# PostgreSQL database to run against the production dialect instead
+os.environ["FLASK_ENV"] = "testing"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("JWT_SECRET_KEY", "test-jwt-secret-key-0123456789abcdef")
+os.environ.setdefault(
+    "DATABASE_URL_TEST",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(), "test.db"),
+)
+
+import pytest  # noqa: E402
+from flask_jwt_extended import create_access_token  # noqa: E402
+
+from app import create_app, db  # noqa: E402
+from app.models import Book, Category, User  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    """Create the app with fresh tables for each test."""
+    app = create_app()
+    # Tokens carry the integer user id as their subject
+    app.config["JWT_VERIFY_SUB"] = False
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def user(app):
+    """Create a regular user."""
+    user = User(email="reader@example.com")
+    user.set_password("Passw0rd!")
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+@pytest.fixture
+def auth_headers(user):
+    """Return Authorization headers for `user`."""
+    token = create_access_token(identity=user.id)
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def book(app):
+    """Create an in-stock book in its own category."""
+    category = Category(name="Fiction")
+    book = Book(
+        title="The Hobbit",
+        author="J.R.R. Tolkien",
+        isbn="9780547928227",
+        price=12.5,
+        stock=10,
+        category=category,
+    )
+    db.session.add_all([category, book])
+    db.session.commit()
+    return book
@@ -0,0 +1,26 @@
+"""Tests for the JSON error handlers."""
+
+from decimal import Decimal
+
+from app.error_handlers import InvalidUsage, handle_invalid_usage
+
+
+class PricedInvalidUsage(InvalidUsage):
+    """InvalidUsage whose body carries a value orjson cannot encode."""
+
+    def to_dict(self):
+        return {**super().to_dict(), "price": Decimal("9.99")}
+
+
+def test_invalid_usage_body_falls_back_to_app_encoder(app):
+    with app.test_request_context():
+        response = handle_invalid_usage(
+            PricedInvalidUsage("Price too low.", status_code=422)
+        )
+
+    assert response.status_code == 422
+    assert response.get_json() == {
+        "error": "Price too low.",
+        "status": "error",
+        "price": "9.99",
+    }
@@ -0,0 +1,51 @@
+"""Tests for the order endpoints."""
+
+import pytest
+
+from app.extensions import db
+from app.models import Order, OrderItem
+from app.orders.enums import OrderStatus
+
+
+@pytest.fixture
+def pending_order(user, book):
+    """Create a pending order for one copy of `book`."""
+    order = Order(
+        user_id=user.id,
+        status=OrderStatus.PENDING,
+        total_amount=book.price,
+        items=[OrderItem(book_id=book.id, quantity=1, price_unit=book.price)],
+    )
+    db.session.add(order)
+    db.session.commit()
+    return order
+
+
+def test_pay_returns_items_with_book_details(
+    client, auth_headers, pending_order, book
+):
+    response = client.post(
+        f"/api/orders/{pending_order.id}/pay", headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()["data"]
+    assert data["id"] == pending_order.id
+    assert [
+        (item["book_id"], item["title"], item["author"])
+        for item in data["items"]
+    ] == [(book.id, book.title, book.author)]
+
+
+def test_order_status_is_dumped_as_its_value(
+    client, auth_headers, pending_order
+):
+    detail = client.get(
+        f"/api/orders/{pending_order.id}", headers=auth_headers
+    )
+    paid = client.post(
+        f"/api/orders/{pending_order.id}/pay", headers=auth_headers
+    )
+
+    assert detail.get_json()["data"]["status"] == "pending"
+    assert paid.get_json()["data"]["status"] == "paid"
@@ -1,4 +1,17 @@
 """WSGI entry point for the Flask application."""
-from app import create_app
+import os
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Patch before anything else imports socket/threading; only the web
+# server needs eventlet, so this is kept out of the app package
+if os.getenv("FLASK_ENV", "production") == "production":
+    import eventlet
+
+    eventlet.monkey_patch()
+
+from app import create_app  # noqa: E402
 
 app = create_app()